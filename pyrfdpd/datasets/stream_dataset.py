@@ -0,0 +1,141 @@
+import numpy as np
+import torch
+import torch.multiprocessing as mp
+from torch.utils.data import IterableDataset, get_worker_info
+
+
+def open_series(source, dtype=np.complex64):
+    """
+    Open a complex series without reading it into memory.
+
+    Arguments:
+        source: a .npy file, which is memory mapped, any other path, which is
+            memory mapped as raw interleaved I/Q samples of the given dtype,
+            or an array/tensor, which is used as is.
+        dtype: the complex dtype of raw binary files.
+    """
+    if isinstance(source, torch.Tensor):
+        return source.numpy()
+    if not isinstance(source, str):
+        return np.asarray(source)
+    if source.endswith(".npy"):
+        return np.load(source, mmap_mode="r")
+    return np.memmap(source, dtype=dtype, mode="r")
+
+
+class PAStreamDataset(IterableDataset):
+    def __init__(
+        self,
+        pa_input,
+        pa_output,
+        memory=0,
+        train_ratio=0.8,
+        train=True,
+        inverse=False,
+        chunk_size=65536,
+        shuffle_buffer=0,
+        batch_size=None,
+        seed=0,
+        dtype=np.complex64,
+    ):
+        """
+        Arguments:
+            pa_input, pa_output: the PA input and output series, see open_series.
+            memory: the number of past samples every sample sees. They wrap
+                around the series as in PADataset, and are carried over
+                across chunk boundaries.
+            train_ratio: the share of the series used for training.
+            train: iterate over the training part or the validation part.
+            inverse: inverse modeling (DPD) or not.
+            chunk_size: the number of samples read from disk at once.
+            shuffle_buffer: shuffle within a buffer of this many samples, 0
+                keeps the time order.
+            batch_size: yield whole (inputs, target) batches instead of single
+                samples. Use it with DataLoader(batch_size=None).
+            seed: the shuffle seed, combined with the epoch and worker id.
+            dtype: the complex dtype of raw binary files.
+        """
+        super().__init__()
+        self.pa_input = open_series(pa_input, dtype)
+        self.pa_output = open_series(pa_output, dtype)
+        assert len(self.pa_input) == len(self.pa_output), "The PA input and output should have the same length."
+        if inverse:
+            self.pa_input, self.pa_output = self.pa_output, self.pa_input
+        self.memory = memory
+        self.chunk_size = chunk_size
+        self.shuffle_buffer = shuffle_buffer
+        self.batch_size = batch_size
+        self.seed = seed
+        # shared with the DataLoader workers, which keep their own copy of
+        # the dataset across epochs with persistent_workers
+        self._epoch = mp.Value("q", 0, lock=False)
+        split = int(len(self.pa_input) * train_ratio)
+        self.start, self.stop = (0, split) if train else (split, len(self.pa_input))
+
+    def __len__(self):
+        return self.stop - self.start
+
+    @property
+    def epoch(self):
+        return self._epoch.value
+
+    def set_epoch(self, epoch):
+        """Reseed the shuffle buffer for a new epoch, also in running workers."""
+        self._epoch.value = epoch
+
+    def transform(self, x, y):
+        """
+        Turn a chunk into samples. x holds memory history samples in front of
+        the len(y) samples of the chunk. Subclasses define the input layout.
+        """
+        raise NotImplementedError
+
+    def _shard(self):
+        # contiguous shards, one per DataLoader worker
+        info = get_worker_info()
+        if info is None:
+            return self.start, self.stop, 0
+        per_worker = -(-len(self) // info.num_workers)
+        start = min(self.start + info.id * per_worker, self.stop)
+        return start, min(start + per_worker, self.stop), info.id
+
+    def _history(self, start):
+        # the memory samples before start, wrapped around the series
+        index = np.arange(start - self.memory, start) % len(self.pa_input)
+        return np.asarray(self.pa_input[index], dtype=np.complex64)
+
+    def _chunks(self, start, stop):
+        history = self._history(start)
+        for begin in range(start, stop, self.chunk_size):
+            end = min(begin + self.chunk_size, stop)
+            x = np.concatenate((history, np.asarray(self.pa_input[begin:end], dtype=np.complex64)))
+            y = np.array(self.pa_output[begin:end], dtype=np.complex64)
+            history = x[len(x) - self.memory :]
+            yield self.transform(torch.from_numpy(x), torch.from_numpy(y))
+
+    def _shuffled(self, chunks, generator):
+        # keep at most shuffle_buffer samples back, release the rest shuffled
+        buffer = None
+        for inputs, target in chunks:
+            if buffer is not None:
+                inputs = torch.cat((buffer[0], inputs))
+                target = torch.cat((buffer[1], target))
+            order = torch.randperm(len(inputs), generator=generator)
+            keep = min(self.shuffle_buffer, len(inputs))
+            buffer = inputs[order[:keep]], target[order[:keep]]
+            yield inputs[order[keep:]], target[order[keep:]]
+        if buffer is not None:
+            yield buffer
+
+    def __iter__(self):
+        start, stop, worker = self._shard()
+        chunks = self._chunks(start, stop)
+        if self.shuffle_buffer:
+            generator = torch.Generator().manual_seed(hash((self.seed, self.epoch, worker)) % 2**63)
+            chunks = self._shuffled(chunks, generator)
+        for inputs, target in chunks:
+            if self.batch_size:
+                for begin in range(0, len(inputs), self.batch_size):
+                    yield inputs[begin : begin + self.batch_size], target[begin : begin + self.batch_size]
+            else:
+                yield from zip(inputs, target)
@@ -2,6 +2,27 @@ import torch
 from . import rvtdnn
 
 
+def features(windows_i, windows_q, order, order_memory, dtype=torch.float32):
+    """
+    Append the augmented terms to the RVTDNN input windows.
+
+    Parameters:
+    - windows_i, windows_q: The (N, memory+1) I and Q input windows
+    - order, order_memory: see Dataset
+    - dtype: The dtype of the returned (N, 2*(memory+1) + (order_memory+1)*order) tensor
+    """
+    memory = windows_i.shape[1] - 1
+    width = 2 * (memory + 1)
+    out = torch.empty((windows_i.shape[0], width + (order_memory + 1) * order), dtype=dtype)
+    out[:, : memory + 1] = windows_i
+    out[:, memory + 1 : width] = windows_q
+    amplitude = torch.abs(torch.complex(windows_i, windows_q))
+    for j in range(order_memory + 1):
+        for i in range(1, order + 1):
+            out[:, width + j * order + i - 1] = torch.pow(amplitude[:, j], i)
+    return out
+
+
 class Dataset(rvtdnn.Dataset):
     def __init__(
         self,
@@ -14,19 +35,20 @@ class Dataset(rvtdnn.Dataset):
         order_memory=2,
         train=True,
         inverse=False,
+        dtype=torch.float32,
     ):
-        """order_memory is the memory of augumented terms"""
+        """
+        order_memory is the memory of augumented terms, dtype is the storage
+        of the feature tensor, torch.float16 halves its memory, the samples
+        are always served in float32
+        """
         assert order >= 1
+        assert order_memory <= memory, "The augmented terms cannot reach beyond the memory depth."
         super().__init__(
             root_dir, pa_input, pa_output, train_ratio, memory, train, inverse
         )
         self.order = order
         self.order_memory = order_memory
-
-    def __len__(self):
-        return super().__len__()
-
-    def __getitem__(self, index):
         # Data array pattern
         # Except the items in RVTDNN, add augmented terms
         # for example : order = 3, order_memory = 1
@@ -36,17 +58,53 @@ class Dataset(rvtdnn.Dataset):
         # |x(1)|
         # |x(1)|^2
         # |x(1)|^3
-        inputs, target = super().__getitem__(index)
-        for j in range(self.order_memory + 1):
-            amplitude_org = torch.abs(
-                torch.complex(inputs[j], inputs[j + self.memory + 1])
-            )
-            amplitude = torch.zeros(self.order)
-            amplitude[0] = amplitude_org
-            for i in range(2, self.order + 1):
-                amplitude[i - 1] = torch.pow(amplitude_org, i)
-            inputs = torch.cat((inputs, amplitude))
-        return inputs, target
+        # The features of the whole series are computed once into a single
+        # preallocated tensor, one row per sample.
+        self.features = features(self.windows_i, self.windows_q, order, order_memory, dtype)
+
+    def __len__(self):
+        return super().__len__()
+
+    def __getitem__(self, index):
+        return self.features[index].float(), self.targets[index]
+
+    def tensors(self):
+        """
+        Return the inputs and targets of the whole dataset as two tensors, the
+        inputs in the storage dtype, without a copy.
+        """
+        return self.features[: len(self)], self.targets[: len(self)]
+
+
+class StreamDataset(rvtdnn.StreamDataset):
+    """
+    The ARVTDNN dataset read chunk by chunk from disk, see rvtdnn.StreamDataset,
+    with the augmented terms of Dataset.
+    """
+
+    def __init__(
+        self,
+        pa_input,
+        pa_output,
+        train_ratio=0.8,
+        memory=3,
+        order=3,
+        order_memory=2,
+        train=True,
+        inverse=False,
+        **kwargs,
+    ):
+        assert order >= 1
+        assert order_memory <= memory, "The augmented terms cannot reach beyond the memory depth."
+        super().__init__(pa_input, pa_output, train_ratio, memory, train, inverse, **kwargs)
+        self.order = order
+        self.order_memory = order_memory
+
+    def transform(self, x, y):
+        windows_i = x.real.unfold(0, self.memory + 1, 1)
+        windows_q = x.imag.unfold(0, self.memory + 1, 1)
+        inputs = features(windows_i, windows_q, self.order, self.order_memory)
+        return inputs, torch.stack((y.real, y.imag), dim=1)
 
 
 ARVTDNN = rvtdnn.RVTDNN
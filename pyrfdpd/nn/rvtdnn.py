@@ -1,6 +1,7 @@
 import torch
 import torch.nn as nn
 from ..datasets.pa_dataset import PADataset
+from ..datasets.stream_dataset import PAStreamDataset
 
 
 class Dataset(PADataset):
@@ -41,6 +42,14 @@ class Dataset(PADataset):
         self.train = train
         self.train_ratio = train_ratio
         self.memory = memory
+        # Sample n sees the inputs n-memory..n, wrapped around the series, so
+        # the last memory samples are prepended once and every input row is a
+        # zero-copy sliding window over the padded I and Q signals.
+        pa_input, pa_output = self.getseries()
+        padded = torch.cat((pa_input[len(pa_input) - memory :], pa_input))
+        self.windows_i = padded.real.float().unfold(0, memory + 1, 1)
+        self.windows_q = padded.imag.float().unfold(0, memory + 1, 1)
+        self.targets = torch.stack((pa_output.real, pa_output.imag), dim=1).float()
 
     def __len__(self):
         if self.train:
@@ -49,21 +58,54 @@ class Dataset(PADataset):
             return super().__len__() - int(super().__len__() * self.train_ratio)
 
     def __getitem__(self, index):
-        inputs = torch.zeros((self.memory + 1) * 2)
-        target = torch.zeros(2)
-        index = super().__len__() - self.memory + index
-        for i in range(self.memory + 1):
-            inputs[i] = super().__getitem__((index + i) % super().__len__())[0].real
-            inputs[i + self.memory + 1] = (
-                super().__getitem__((index + i) % super().__len__())[0].imag
-            )
-        target[0] = (
-            super().__getitem__((index + self.memory) % super().__len__())[1].real
-        )
-        target[1] = (
-            super().__getitem__((index + self.memory) % super().__len__())[1].imag
+        """
+        Parameters:
+        - index: a sample index, or a list/tensor of indices for a whole batch
+        """
+        inputs = torch.cat((self.windows_i[index], self.windows_q[index]), dim=-1)
+        return inputs, self.targets[index]
+
+    def __getitems__(self, indices):
+        # batched fetch for DataLoader, one gather instead of a call per sample
+        inputs, target = self[torch.as_tensor(indices)]
+        return list(zip(inputs, target))
+
+    def tensors(self):
+        """
+        Return the inputs and targets of the whole dataset as two tensors.
+        """
+        return self[torch.arange(len(self))]
+
+
+class StreamDataset(PAStreamDataset):
+    """
+    The RVTDNN dataset read chunk by chunk from disk, for captures larger than
+    memory. The samples have the same layout as Dataset.
+
+    Parameters:
+    - pa_input, pa_output: .npy or raw binary files, or arrays
+    - memory: The memory depth of the RVTDNN input samples
+    - kwargs: chunk_size, shuffle_buffer, batch_size, seed and dtype, see PAStreamDataset
+    """
+
+    def __init__(
+        self,
+        pa_input,
+        pa_output,
+        train_ratio=0.8,
+        memory=3,
+        train=True,
+        inverse=False,
+        **kwargs,
+    ):
+        super().__init__(pa_input, pa_output, memory, train_ratio, train, inverse, **kwargs)
+
+    def transform(self, x, y):
+        inputs = torch.cat(
+            (x.real.unfold(0, self.memory + 1, 1), x.imag.unfold(0, self.memory + 1, 1)),
+            dim=1,
         )
-        return inputs, target
+        return inputs, torch.stack((y.real, y.imag), dim=1)
 
 
 class RVTDNN(nn.Module):
@@ -2,7 +2,13 @@ import os
 import torch
 import torch.nn as nn
 import torch.optim as optim
-from torch.utils.data import DataLoader
+from torch.utils.data import (
+    BatchSampler,
+    DataLoader,
+    IterableDataset,
+    RandomSampler,
+    SequentialSampler,
+)
 from torch.utils.tensorboard import SummaryWriter
 from datetime import datetime
 import pdb
@@ -19,7 +25,27 @@ class Trainer:
         optimizer=optim.Adam,
         tensorboard: bool = False,
         logger=None,
+        fast: bool = True,
+        shuffle: bool = True,
+        num_workers: int = 0,
+        persistent_workers: bool = False,
+        predict_batch_size: int = 8192,
+        bfloat16: bool = False,
+        compiled: bool = False,
     ) -> None:
+        """
+        Parameters:
+        - fast: Move the tensors of datasets with a tensors() method, e.g.
+          rvtdnn.Dataset, to the device once and slice the batches from them
+        - shuffle: Shuffle the training batches every epoch
+        - num_workers, persistent_workers: The DataLoader workers of the
+          datasets that cannot be materialized, e.g. StreamDataset
+        - predict_batch_size: The batch size of predict
+        - bfloat16: Run the network under bfloat16 autocast, the loss is
+          still computed in float32
+        - compiled: Wrap the network with torch.compile, falling back to
+          eager mode if compilation fails
+        """
         self.device = (
             torch.device("cuda") if torch.cuda.is_available() else torch.device("cpu")
         )
@@ -28,12 +54,17 @@ class Trainer:
         self.lr = lr
         self.batch_size = batch_size
         self.optimizer = optimizer(self.net.parameters(), self.lr)
+        self.fast = fast
+        self.shuffle = shuffle
+        self.num_workers = num_workers
+        self.persistent_workers = persistent_workers and num_workers > 0
+        self.predict_batch_size = predict_batch_size
+        self.bfloat16 = bfloat16
+        self.logger = logger
+        # the callable the batches go through, self.net holds the parameters
+        self.model = self.compile(self.net) if compiled else self.net
         self.timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        if logger:
-            self.logger = logger
-            self.logger.debug(f"Training on device {self.device}.")
-        else:
-            print(f"Training on device {self.device}.")
+        self.log(f"Training on device {self.device}.")
 
         if tensorboard:
             self.writer = SummaryWriter("runs/" + name + "_{}".format(self.timestamp))
@@ -47,20 +78,87 @@ class Trainer:
             self.writer.add_graph(self.net, rand_input.to(self.device))
             self.writer.flush()
 
+    def log(self, message):
+        if self.logger:
+            self.logger.debug(message)
+        else:
+            print(message)
+
+    def compile(self, net):
+        """
+        Return torch.compile(net), or net if compilation is unavailable. A
+        first call on a dummy batch triggers the compilation here.
+        """
+        try:
+            model = torch.compile(net)
+            with torch.no_grad():
+                model(torch.zeros(2, next(net.parameters()).size(1), device=self.device))
+            return model
+        except Exception as error:
+            self.log(f"torch.compile is unavailable, running eagerly: {error}")
+            return net
+
+    def forward(self, inputs):
+        with torch.autocast(self.device.type, torch.bfloat16, enabled=self.bfloat16):
+            return self.model(inputs)
+
+    def loader(self, data_set, batch_size=None, shuffle=False, ordered=False):
+        """
+        Return a reusable iterable over the (inputs, target) batches of a
+        dataset, on the device.
+
+        Datasets with a tensors() method are materialized on the device once
+        in fast mode, and every pass draws a new random permutation of index
+        batches if shuffle is True. The other datasets go through a DataLoader,
+        which hands the tensor-backed ones whole index batches to gather.
+        With ordered, the samples of iterable datasets come in series order,
+        read in this process, since the DataLoader workers interleave their
+        contiguous shards.
+        """
+        batch_size = batch_size or self.batch_size
+        num_workers = self.num_workers
+        if self.fast and hasattr(data_set, "tensors"):
+            return _TensorLoader(data_set.tensors(), batch_size, shuffle, self.device)
+        sampler = None
+        if hasattr(data_set, "tensors"):
+            # the dataset gathers a whole batch in one indexing call
+            sampler = RandomSampler(data_set) if shuffle else SequentialSampler(data_set)
+            sampler = BatchSampler(sampler, batch_size, drop_last=False)
+            batch_size, shuffle = None, False
+        elif isinstance(data_set, IterableDataset):
+            shuffle = False  # the dataset shuffles itself, e.g. StreamDataset
+            if getattr(data_set, "batch_size", None):
+                batch_size = None  # and yields whole batches
+            if ordered:
+                assert not getattr(data_set, "shuffle_buffer", 0), "The dataset should not be shuffled."
+                num_workers = 0
+        return _DeviceLoader(
+            DataLoader(
+                data_set,
+                batch_size=batch_size,
+                shuffle=shuffle,
+                sampler=sampler,
+                num_workers=num_workers,
+                persistent_workers=self.persistent_workers and num_workers > 0,
+                pin_memory=self.device.type == "cuda",
+            ),
+            self.device,
+        )
+
     def train(self, training_set, validation_set, epochs=1000, patiences=10):
-        training_loader = DataLoader(training_set, batch_size=self.batch_size)
-        validation_loader = DataLoader(validation_set, batch_size=self.batch_size)
+        training_loader = self.loader(training_set, shuffle=self.shuffle)
+        validation_loader = self.loader(validation_set)
         patience = 0
         last_vloss = 10
         for epoch in range(epochs):
             self.net.train()
+            if hasattr(training_set, "set_epoch"):
+                training_set.set_epoch(epoch)
             for data in training_loader:
                 inputs, target = data
-                inputs = inputs.to(self.device)
-                target = target.to(self.device)
                 self.optimizer.zero_grad()
-                outputs = self.net(inputs)
-                loss = self.lossFcn(outputs, target)
+                outputs = self.forward(inputs)
+                loss = self.lossFcn(outputs.float(), target)
                 loss.backward()
                 self.optimizer.step()
 
@@ -69,10 +167,8 @@ class Trainer:
             with torch.no_grad():
                 for idx, vdata in enumerate(validation_loader):
                     vinputs, vtarget = vdata
-                    vinputs = vinputs.to(self.device)
-                    vtarget = vtarget.to(self.device)
-                    voutputs = self.net(vinputs)
-                    vloss = self.lossFcn(voutputs, vtarget)
+                    voutputs = self.forward(vinputs)
+                    vloss = self.lossFcn(voutputs.float(), vtarget)
                     running_vloss += vloss.item()
 
             avg_loss = loss.item()  # loss of the last batch
@@ -94,38 +190,76 @@ class Trainer:
                 patience = 0
             last_vloss = avg_vloss
 
-            if self.logger:
-                self.logger.debug(
-                    f"epoch{epoch+1:4d}, loss: train {avg_loss:.6f}, validation {avg_vloss:.6f}, patience {patience}"
-                )
-            else:
-                print(
-                    f"epoch{epoch+1:4d}, loss: train {avg_loss:.6f}, validation {avg_vloss:.6f}, patience {patience}"
-                )
-        if self.logger:
-            self.logger.debug("Finished Training!")
+            self.log(
+                f"epoch{epoch+1:4d}, loss: train {avg_loss:.6f}, validation {avg_vloss:.6f}, patience {patience}"
+            )
+        self.log("Finished Training!")
+
+    def predict(self, data_set, batch_size=None, numpy=False):
+        """
+        Run the network over a whole dataset in order, e.g. to predistort the
+        original waveform.
+
+        Parameters:
+        - data_set: The dataset, its targets are ignored, a StreamDataset is
+          read without workers and without shuffle_buffer
+        - batch_size: The inference batch size, predict_batch_size by default
+        - numpy: Return a NumPy array sharing the memory of the output
+
+        Returns:
+        The complex64 output samples on the CPU, as a tensor or a NumPy array
+        """
+        data_loader = self.loader(data_set, batch_size or self.predict_batch_size, ordered=True)
+        # I/Q pairs, viewed as complex64 once filled
+        predict_data = torch.empty(len(data_set), 2, device=self.device)
+        start = 0
+        self.net.eval()
+        with torch.inference_mode():
+            for inputs, _ in data_loader:
+                outputs = self.forward(inputs)
+                predict_data[start : start + len(outputs)] = outputs
+                start += len(outputs)
+        predict_data = torch.view_as_complex(predict_data[:start].cpu())
+        return predict_data.numpy() if numpy else predict_data
+
+
+class _TensorLoader:
+    # batches sliced from tensors that live on the device, the inputs stay in
+    # their storage dtype, e.g. float16 ARVTDNN features, and are cast per batch
+    def __init__(self, tensors, batch_size, shuffle, device):
+        self.inputs, self.target = (t.to(device) for t in tensors)
+        self.batch_size = batch_size
+        self.shuffle = shuffle
+
+    def __len__(self):
+        return -(-len(self.inputs) // self.batch_size)
+
+    def __iter__(self):
+        if self.shuffle:
+            index = torch.randperm(len(self.inputs), device=self.inputs.device)
+            for start in range(0, len(index), self.batch_size):
+                batch = index[start : start + self.batch_size]
+                yield self.inputs[batch].float(), self.target[batch]
         else:
-            print("Finished Training!")
-
-    def predict(self, data_set):
-        data_loader = DataLoader(data_set, batch_size=self.batch_size)
-        # predict_data is in GPU
-        predict_data = torch.empty(0).to(self.device)
-        # target_data is in CPU
-        target_data = torch.empty(0)
-        with torch.no_grad():
-            for data in data_loader:
-                inputs, target = data
-                outputs = self.net(inputs.to(self.device))
-                predict_data = torch.cat(
-                    (
-                        predict_data,
-                        torch.complex(outputs[:, 0], outputs[:, 1]).flatten(),
-                    ),
-                    dim=0,
-                )
-                target_data = torch.cat(
-                    (target_data, torch.complex(target[:, 0], target[:, 1]).flatten()),
-                    dim=0,
+            for start in range(0, len(self.inputs), self.batch_size):
+                yield (
+                    self.inputs[start : start + self.batch_size].float(),
+                    self.target[start : start + self.batch_size],
                 )
-        return predict_data.cpu()
+
+
+class _DeviceLoader:
+    # moves the batches of a DataLoader to the device
+    def __init__(self, loader, device):
+        self.loader = loader
+        self.device = device
+
+    def __len__(self):
+        return len(self.loader)
+
+    def __iter__(self):
+        for inputs, target in self.loader:
+            yield (
+                inputs.to(self.device, non_blocking=True),
+                target.to(self.device, non_blocking=True),
+            )
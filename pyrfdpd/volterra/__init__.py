@@ -1,2 +1,21 @@
+from pyrfdpd.volterra import basis
+from pyrfdpd.volterra import batch
+from pyrfdpd.volterra import cache
+from pyrfdpd.volterra import correlation
+from pyrfdpd.volterra import feedback
+from pyrfdpd.volterra import filterbank
+from pyrfdpd.volterra import fixedpoint
+from pyrfdpd.volterra import lut
+from pyrfdpd.volterra import solver
+from pyrfdpd.volterra import sparse
+from pyrfdpd.volterra import streaming
+from pyrfdpd.volterra import model
+from pyrfdpd.volterra import selection
+from pyrfdpd.volterra import adaptive
 from pyrfdpd.volterra import mp
-from pyrfdpd.volterra import gmp
\ No newline at end of file
+from pyrfdpd.volterra import gmp
+from pyrfdpd.volterra import ddr
+from pyrfdpd.volterra import sweep
+from pyrfdpd.volterra.model import load
+from pyrfdpd.volterra.mp import MPModel
+from pyrfdpd.volterra.gmp import GMPModel
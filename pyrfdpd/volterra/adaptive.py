@@ -0,0 +1,133 @@
+'''
+Copyright 2026 Microwave System Lab or its affiliates. All Rights Reserved.
+File: adaptive.py
+Authors:
+agent, agent@local
+
+Description:
+Online adaptive coefficient update of the Volterra models, to track a slowly
+drifting PA from new feedback data instead of re-extracting from scratch.
+
+    RLS:      recursive least squares with a forgetting factor, updated
+              sample by sample, O(P^2) per sample
+    BlockRLS: exponentially weighted least squares updated once per block,
+              O(B*P^2 + P^3) per block of B samples
+    NLMS:     normalized least mean squares, O(P) per sample
+
+All estimators update the coefficients of the model they are given in place
+and carry the memory history across the blocks, see streaming.BlockBasis.
+
+Revision history:
+Version   Date        Author      Changes
+1.0    2026-10-17    agent       initial version
+'''
+import numpy as np
+from .solver import NORMAL, gram, solve_normal
+from .streaming import BlockBasis
+
+
+class _Adaptive:
+    def __init__(self, model):
+        self.model = model
+        if model.coef is None:
+            model.coef = np.zeros(len(model.terms), dtype=np.complex128)
+        else:
+            model.coef = np.array(model.coef, dtype=np.complex128)
+        self.stream = BlockBasis(model.terms)
+
+    def update(self, x: np.ndarray, y: np.ndarray)->np.ndarray:
+        """
+        Update the model coefficients from a new block of PA input x and
+        PA output y.
+
+        Returns:
+            coef: the updated coefficients, also stored in the model
+        """
+        X, target = self.stream.push(x, y)
+        if X is not None:
+            self._update(X, target)
+        return self.model.coef
+
+
+class RLS(_Adaptive):
+    """
+    Recursive least squares, minimizing sum_i forgetting^(n-i) |y(i) - X(i) coef|^2.
+
+    Args:
+        model: a VolterraModel, fitted or not
+        forgetting: the forgetting factor, in (0, 1]
+        delta: the initial inverse correlation matrix is I/delta, a small
+               value lets the first samples override the initial coefficients
+    """
+
+    def __init__(self, model, forgetting=0.999, delta=1e-2):
+        assert 0 < forgetting <= 1, "The forgetting factor should be in (0, 1]."
+        super().__init__(model)
+        self.forgetting = forgetting
+        self.P = np.eye(len(model.terms), dtype=np.complex128) / delta
+
+    def _update(self, X, y):
+        coef, P, lam = self.model.coef, self.P, self.forgetting
+        for row, target in zip(np.ascontiguousarray(X), y):
+            v = np.conjugate(row)
+            Pv = P.dot(v)
+            k = Pv / (lam + row.dot(Pv))
+            coef += k * (target - row.dot(coef))
+            P -= np.outer(k, np.conjugate(Pv))
+            P += np.conjugate(P.T)  # keep P Hermitian against round-off
+            P /= 2*lam
+
+
+class BlockRLS(_Adaptive):
+    """
+    Exponentially weighted least squares updated once per block. Every
+    sample is weighted by forgetting^(age in samples), as in RLS.
+
+    Args:
+        model: a VolterraModel, fitted or not
+        forgetting: the forgetting factor per sample, in (0, 1]
+        solver: least-squares backend, see pyrfdpd.volterra.solver
+        lam: regularization of the normal equations
+    """
+
+    def __init__(self, model, forgetting=0.999, solver="cholesky", lam=1e-6):
+        assert 0 < forgetting <= 1, "The forgetting factor should be in (0, 1]."
+        assert solver in NORMAL, f"The recursive normal equations need one of the solvers {NORMAL}."
+        super().__init__(model)
+        self.forgetting = forgetting
+        self.solver = solver
+        self.lam = lam
+        P = len(model.terms)
+        self.G = np.zeros((P, P), dtype=np.complex128)
+        self.b = np.zeros(P, dtype=np.complex128)
+
+    def _update(self, X, y):
+        weights = np.sqrt(self.forgetting ** np.arange(len(y)-1, -1, -1))
+        G, b = gram(X * weights[:, None], y * weights)
+        decay = self.forgetting ** len(y)
+        self.G = decay*self.G + G
+        self.b = decay*self.b + b
+        self.model.coef = solve_normal(self.G, self.b, self.solver, self.lam)
+
+
+class NLMS(_Adaptive):
+    """
+    Normalized least mean squares.
+
+    Args:
+        model: a VolterraModel, fitted or not
+        mu: the step size, in (0, 2)
+        eps: regularization of the normalization
+    """
+
+    def __init__(self, model, mu=0.1, eps=1e-9):
+        assert 0 < mu < 2, "The step size should be in (0, 2)."
+        super().__init__(model)
+        self.mu = mu
+        self.eps = eps
+
+    def _update(self, X, y):
+        coef = self.model.coef
+        norms = np.einsum('ij,ij->i', X.real, X.real) + np.einsum('ij,ij->i', X.imag, X.imag)
+        for row, target, norm in zip(np.ascontiguousarray(X), y, norms):
+            coef += (self.mu * (target - row.dot(coef)) / (self.eps + norm)) * np.conjugate(row)
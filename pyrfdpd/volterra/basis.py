@@ -0,0 +1,257 @@
+'''
+Copyright 2026 Microwave System Lab or its affiliates. All Rights Reserved.
+File: basis.py
+Authors:
+agent, agent@local
+
+Description:
+The shared basis-matrix builder of the MP and GMP models.
+
+Every regressor of the MP and GMP models has the form
+
+    x(n - ds) * |x(n - de)|^p
+
+where ds is the signal delay, de is the envelope delay (negative for the
+leading terms of GMP) and p is the envelope power. A model structure is
+therefore fully described by a term table of shape (P, 3) holding one
+(ds, de, p) row per column of the basis matrix.
+
+Column layout of MP, M memory depth and K non-linearity order:
+    column m*(K+1)+k        : x(n-m) * |x(n-m)|^k          m <= M, k <= K
+
+Column layout of GMP, K = [Ka, Kb, Kc], L = [La, Lb, Lc], M = [Mb, Mc]:
+    aligned terms, offset 0
+    column k*La+l           : x(n-l) * |x(n-l)|^k          k < Ka, l < La
+    lagging terms, offset Ka*La
+    column k*Lb*Mb+l*Mb+m   : x(n-l) * |x(n-l-m-1)|^(k+1)  k < Kb, l < Lb, m < Mb
+    leading terms, offset Ka*La+Kb*Lb*Mb
+    column k*Lc*Mc+l*Mc+m   : x(n-l) * |x(n-l+m+1)|^(k+1)  k < Kc, l < Lc, m < Mc
+
+The builders work on a padded signal xp holding `lag` history samples in
+front of and `lead` future samples behind the N evaluated samples, so that
+x(n - d) is xp[lag + n - d]. All builders run in complex128 by default or in
+complex64 on request. The |x|^p power table is computed once per call
+and all delayed columns are taken from strided views of it. The circular
+variants wrap the signal around itself, which is the periodic behaviour of
+MP_e/MP_v and GMP_e/GMP_v.
+
+Revision history:
+Version   Date        Author      Changes
+1.0    2026-10-17    agent       initial version
+'''
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+
+def mp_terms(M, K)->np.ndarray:
+    """
+    The (ds, de, p) term table of the MP model, in basis column order.
+
+    Args:
+        M: memory depth
+        K: non-linearity order
+
+    Returns:
+        terms: integer array of shape ((M+1)*(K+1), 3)
+    """
+    m, k = np.meshgrid(np.arange(M+1), np.arange(K+1), indexing='ij')
+    return np.stack([m.ravel(), m.ravel(), k.ravel()], axis=1)
+
+def gmp_terms(K: list, L: list, M: list)->np.ndarray:
+    """
+    The (ds, de, p) term table of the GMP model, in basis column order.
+
+    Args:
+        K: non-linearity order, three terms
+        L: lagging depth, three terms
+        M: memory depth, two terms
+
+    Returns:
+        terms: integer array of shape (Ka*La + Kb*Lb*Mb + Kc*Lc*Mc, 3)
+    """
+    assert len(K) == 3 and len(L) == 3 and len(M) == 2, "GMP needs three K, three L and two M terms."
+    Ka, Kb, Kc = K
+    La, Lb, Lc = L
+    Mb, Mc = M
+    k, l = np.meshgrid(np.arange(Ka), np.arange(La), indexing='ij')
+    align = np.stack([l.ravel(), l.ravel(), k.ravel()], axis=1)
+    k, l, m = np.meshgrid(np.arange(Kb), np.arange(Lb), np.arange(Mb), indexing='ij')
+    lag = np.stack([l.ravel(), (l+m+1).ravel(), (k+1).ravel()], axis=1)
+    k, l, m = np.meshgrid(np.arange(Kc), np.arange(Lc), np.arange(Mc), indexing='ij')
+    lead = np.stack([l.ravel(), (l-m-1).ravel(), (k+1).ravel()], axis=1)
+    return np.concatenate([align, lag, lead]).astype(int)
+
+def term_depth(terms: np.ndarray)->tuple:
+    """
+    Number of history (lag) and future (lead) samples a term table needs.
+    """
+    if len(terms) == 0:
+        return 0, 0
+    delays = terms[:, :2]
+    return max(int(delays.max()), 0), max(-int(delays.min()), 0)
+
+def circular_pad(x: np.ndarray, lag, lead)->np.ndarray:
+    """
+    Wrap a periodic signal around itself by `lag` samples in front and `lead`
+    samples behind.
+    """
+    x = np.ravel(x)
+    N = len(x)
+    assert lag <= N and lead <= N, "The signal is shorter than the model memory."
+    return np.concatenate([x[N-lag:], x, x[:lead]])
+
+def power_table(a: np.ndarray, K)->np.ndarray:
+    """
+    The table of envelope powers, row k holds a^k for k = 0..K.
+    """
+    table = np.empty((K+1, len(a)), dtype=a.dtype)
+    table[0] = 1
+    for k in range(1, K+1):
+        np.multiply(table[k-1], a, out=table[k])
+    return table
+
+def _clean(xp, dtype=np.complex128):
+    # Zeroing NaN samples up front is equivalent to zeroing NaN columns
+    # afterwards, since every column carries a positive power of the sample
+    # or multiplies it directly.
+    xp = np.ravel(xp).astype(dtype, copy=False)
+    if np.isnan(xp).any():
+        xp = np.where(np.isnan(xp), 0, xp)
+    return xp
+
+def mp_basis_padded(xp: np.ndarray, M, K, dtype=np.complex128)->np.ndarray:
+    """
+    Build the MP basis matrix of a signal padded with M history samples.
+
+    Args:
+        xp: the padded PA input signal, of length N+M
+        M: memory depth
+        K: non-linearity order
+        dtype: np.complex128, or np.complex64 for half the memory traffic
+
+    Returns:
+        X: the (N, (M+1)*(K+1)) basis matrix, see the module description for
+           the column layout
+    """
+    xp = _clean(xp, dtype)
+    N = len(xp) - M
+    branch = xp * power_table(np.abs(xp), K)
+    X = np.empty((N, (M+1)*(K+1)), dtype=dtype, order='F')
+    # window[k, j, n] = branch[k, j+n], so x(n-m) sits at j = M-m
+    window = sliding_window_view(branch, N, axis=1)
+    X.T.reshape(M+1, K+1, N)[...] = window[:, ::-1].transpose(1, 0, 2)
+    return X
+
+def gmp_basis_padded(xp: np.ndarray, K: list, L: list, M: list, dtype=np.complex128)->np.ndarray:
+    """
+    Build the GMP basis matrix of a signal padded by `gmp_depth(K, L, M)`.
+
+    Args:
+        xp: the padded PA input signal, of length lag+N+lead
+        K: non-linearity order, three terms
+        L: lagging depth, three terms
+        M: memory depth, two terms
+        dtype: np.complex128, or np.complex64 for half the memory traffic
+
+    Returns:
+        X: the (N, Ka*La + Kb*Lb*Mb + Kc*Lc*Mc) basis matrix, see the module
+           description for the column layout
+    """
+    Ka, Kb, Kc = K
+    La, Lb, Lc = L
+    Mb, Mc = M
+    lag, lead = gmp_depth(K, L, M)
+    xp = _clean(xp, dtype)
+    N = len(xp) - lag - lead
+    table = power_table(np.abs(xp), max(Ka-1, Kb, Kc, 0))
+    X = np.empty((N, Ka*La + Kb*Lb*Mb + Kc*Lc*Mc), dtype=dtype, order='F')
+    XT = X.T
+    # x_view[j] = xp[j:j+N] and env[p, j] = |xp[j:j+N]|^p, x(n-d) sits at j = lag-d
+    x_view = sliding_window_view(xp, N)
+    env = sliding_window_view(table, N, axis=1)
+
+    if Ka*La:
+        window = sliding_window_view(xp * table[:Ka], N, axis=1)
+        XT[:Ka*La].reshape(Ka, La, N)[...] = window[:, lag-La+1:lag+1][:, ::-1]
+
+    offset = Ka*La
+    if Kb*Lb*Mb:
+        block = XT[offset:offset+Kb*Lb*Mb].reshape(Kb, Lb, Mb, N)
+        for l in range(Lb):
+            np.multiply(x_view[lag-l], env[1:Kb+1, lag-l-Mb:lag-l][:, ::-1], out=block[:, l])
+
+    offset += Kb*Lb*Mb
+    if Kc*Lc*Mc:
+        block = XT[offset:].reshape(Kc, Lc, Mc, N)
+        for l in range(Lc):
+            np.multiply(x_view[lag-l], env[1:Kc+1, lag-l+1:lag-l+Mc+1], out=block[:, l])
+    return X
+
+def term_basis_padded(xp: np.ndarray, terms: np.ndarray, dtype=np.complex128)->np.ndarray:
+    """
+    Build the basis matrix of an arbitrary term table, e.g. a pruned model,
+    on a signal padded by `term_depth(terms)`.
+
+    Args:
+        xp: the padded PA input signal
+        terms: the (P, 3) term table
+        dtype: np.complex128, or np.complex64 for half the memory traffic
+
+    Returns:
+        X: the (N, P) basis matrix, one column per term
+    """
+    lag, lead = term_depth(terms)
+    xp = _clean(xp, dtype)
+    N = len(xp) - lag - lead
+    table = power_table(np.abs(xp), int(terms[:, 2].max()) if len(terms) else 0)
+    X = np.empty((N, len(terms)), dtype=dtype, order='F')
+    for c, (ds, de, p) in enumerate(terms):
+        np.multiply(xp[lag-ds:lag-ds+N], table[p, lag-de:lag-de+N], out=X[:, c])
+    return X
+
+def term_basis_rows(x: np.ndarray, terms: np.ndarray, rows: np.ndarray, dtype=np.complex128)->np.ndarray:
+    """
+    Build only the given rows of the basis matrix of a periodic signal, each
+    row keeping its full memory context, e.g. for a selected training subset.
+
+    Args:
+        x: the whole periodic PA input signal
+        terms: the (P, 3) term table
+        rows: the sample indices to build the rows of
+        dtype: np.complex128, or np.complex64 for half the memory traffic
+
+    Returns:
+        X: the (len(rows), P) basis matrix, one column per term
+    """
+    lag, lead = term_depth(terms)
+    xp = _clean(circular_pad(x, lag, lead), dtype)
+    a = np.abs(xp)
+    rows = np.asarray(rows) + lag
+    X = np.empty((len(rows), len(terms)), dtype=dtype, order='F')
+    for c, (ds, de, p) in enumerate(terms):
+        np.multiply(xp[rows-ds], a[rows-de]**p, out=X[:, c])
+    return X
+
+def gmp_depth(K: list, L: list, M: list)->tuple:
+    """
+    Number of history (lag) and future (lead) samples the GMP model needs.
+    """
+    return term_depth(gmp_terms(K, L, M))
+
+def mp_basis(x: np.ndarray, M, K, dtype=np.complex128)->np.ndarray:
+    """
+    Build the MP basis matrix of a periodic signal.
+    """
+    return mp_basis_padded(circular_pad(x, M, 0), M, K, dtype)
+
+def gmp_basis(x: np.ndarray, K: list, L: list, M: list, dtype=np.complex128)->np.ndarray:
+    """
+    Build the GMP basis matrix of a periodic signal.
+    """
+    return gmp_basis_padded(circular_pad(x, *gmp_depth(K, L, M)), K, L, M, dtype)
+
+def term_basis(x: np.ndarray, terms: np.ndarray, dtype=np.complex128)->np.ndarray:
+    """
+    Build the basis matrix of an arbitrary term table on a periodic signal.
+    """
+    return term_basis_padded(circular_pad(x, *term_depth(terms)), terms, dtype)
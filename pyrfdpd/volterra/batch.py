@@ -0,0 +1,104 @@
+'''
+Copyright 2026 Microwave System Lab or its affiliates. All Rights Reserved.
+File: batch.py
+Authors:
+agent, agent@local
+
+Description:
+Batched multi-channel coefficient extraction, e.g. for the PA chains of an
+antenna array sharing one model structure.
+
+The normal equations of every channel are formed by one BLAS rank-k update
+on its Fortran-ordered basis, as in solver.gram, which the work of N*P^2
+per channel keeps linear in the channel count. Building the bases of all
+channels as one stacked tensor measured slower than this loop. The C
+regularized systems are then solved with one batched np.linalg.solve call,
+and the channels are processed in groups, optionally spread over a process
+pool, which is where the extraction scales.
+
+Revision history:
+Version   Date        Author      Changes
+1.0    2026-10-17    agent       initial version
+'''
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor
+from . import basis
+from . import filterbank
+from .solver import gram
+
+
+def batch_gram(x: np.ndarray, y: np.ndarray, terms: np.ndarray, dtype=np.complex128, accumulate=None)->tuple:
+    """
+    The normal equations of C periodic signals.
+
+    Args:
+        x: the (C, N) PA input signals
+        y: the (C, N) target signals
+        terms: the (P, 3) term table
+        dtype: np.complex128, or np.complex64 to build the bases in single precision
+        accumulate: the dtype to form the normal equations in, see solver.gram
+
+    Returns:
+        G: the (C, P, P) Gram matrices
+        b: the (C, P) projections of y onto the bases
+    """
+    x, y = np.atleast_2d(x), np.atleast_2d(y)
+    normal = [gram(basis.term_basis(xc, terms, dtype), yc, accumulate) for xc, yc in zip(x, y)]
+    return np.stack([G for G, _ in normal]), np.stack([b for _, b in normal])
+
+def _extract(x, y, terms, lam, dtype, accumulate):
+    G, b = batch_gram(x, y, terms, dtype, accumulate)
+    G = G.astype(np.complex128) + lam*np.eye(G.shape[1])
+    # LAPACK has no batched Cholesky solve, the batched LU of np.linalg.solve
+    # is still far cheaper than one Python-level solve per channel
+    return np.linalg.solve(G, b.astype(np.complex128)[..., None])[..., 0]
+
+def extract(x: np.ndarray, y: np.ndarray, terms: np.ndarray, ratio=1, lam=1e-6,
+            dtype=np.complex128, accumulate=None, group=None, n_jobs=1)->np.ndarray:
+    """
+    Extract the coefficients of C channels sharing one model structure.
+
+    Args:
+        x: the (C, N) PA input signals
+        y: the (C, N) measured PA output signals
+        terms: the (P, 3) term table, e.g. basis.mp_terms(M, K)
+        ratio: ratio of samples for extraction
+        lam: regularization of the normal equations
+        dtype: np.complex128, or np.complex64 to build the bases in single precision
+        accumulate: the dtype to form the normal equations in, see solver.gram
+        group: the number of channels per group, all of them by default, or
+               an even split over the workers if n_jobs > 1
+        n_jobs: number of worker processes for the groups, 1 runs them here
+
+    Returns:
+        coef: the (C, P) coefficients
+    """
+    x, y = np.atleast_2d(x), np.atleast_2d(y)
+    assert(x.shape == y.shape), "The shape of x and y should be the same."
+    N = int(ratio * x.shape[1])
+    x, y = x[:, :N], y[:, :N]
+    if group is None:
+        group = -(-len(x) // n_jobs)
+    slices = [slice(start, start+group) for start in range(0, len(x), group)]
+    if n_jobs == 1 or len(slices) == 1:
+        coef = [_extract(x[s], y[s], terms, lam, dtype, accumulate) for s in slices]
+    else:
+        with ProcessPoolExecutor(n_jobs) as pool:
+            futures = [pool.submit(_extract, x[s], y[s], terms, lam, dtype, accumulate) for s in slices]
+            coef = [future.result() for future in futures]
+    return np.concatenate(coef)
+
+def evaluate(x: np.ndarray, terms: np.ndarray, coef: np.ndarray, dtype=np.complex128)->np.ndarray:
+    """
+    Evaluate C channels on their periodic input signals.
+
+    Args:
+        x: the (C, N) PA input signals
+        terms: the (P, 3) term table
+        coef: the (C, P) coefficients
+
+    Returns:
+        y: the (C, N) model outputs
+    """
+    x = np.atleast_2d(x)
+    return np.stack([filterbank.filter_circular(xc, terms, cc, dtype) for xc, cc in zip(x, coef)])
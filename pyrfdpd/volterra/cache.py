@@ -0,0 +1,110 @@
+'''
+Copyright 2026 Microwave System Lab or its affiliates. All Rights Reserved.
+File: cache.py
+Authors:
+agent, agent@local
+
+Description:
+An opt-in memoization of basis matrices across DPD iterations.
+
+In the closed DPD loop the original signal xorg is predistorted with new
+coefficients every iteration, and its basis only depends on the signal and
+the model structure. A BasisCache keys the basis by a blake2b fingerprint of
+the signal content, the term table and the dtype, so after the first
+iteration the evaluation is a single matrix-vector product. The entries
+are evicted in least-recently-used order once their total size exceeds the
+byte budget, and are returned read-only, since they are shared.
+
+The models only cache the basis of predict by default, since the fitted PA
+output changes every iteration and its basis would only push out the one of
+xorg, see VolterraModel(cache_fit=...).
+
+Example:
+    cache = volterra.cache.BasisCache(max_bytes=2**30)
+    dpd = volterra.MPModel(M, K, cache=cache)
+    for idx in range(iteration):
+        dpd.fit(pa_output, pa_input)
+        pa_input = dpd.predict(xorg)  # basis of xorg built once
+    print(cache.stats())
+
+Revision history:
+Version   Date        Author      Changes
+1.0    2026-10-17    agent       initial version
+'''
+import hashlib
+from collections import OrderedDict
+import numpy as np
+
+
+def fingerprint(x: np.ndarray)->bytes:
+    """
+    The blake2b digest of the content, dtype and shape of an array.
+    """
+    x = np.ascontiguousarray(x)
+    h = hashlib.blake2b(digest_size=16)
+    h.update(str((x.dtype.str, x.shape)).encode())
+    h.update(x.view(np.uint8).reshape(-1))
+    return h.digest()
+
+
+class BasisCache:
+    """
+    A least-recently-used cache of basis matrices under a byte budget.
+
+    Args:
+        max_bytes: the budget of all cached matrices, a matrix larger than
+                   it is built but not stored
+    """
+
+    def __init__(self, max_bytes=2**30):
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()
+        self.nbytes = 0
+        self.hits = self.misses = self.evictions = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __repr__(self):
+        return f"BasisCache(entries={len(self)}, nbytes={self.nbytes}, max_bytes={self.max_bytes})"
+
+    def get(self, x: np.ndarray, terms: np.ndarray, dtype, build)->np.ndarray:
+        """
+        The basis of x for a term table, built by `build()` on a miss.
+
+        Args:
+            x: the signal the basis is built on
+            terms: the term table of the model structure
+            dtype: the dtype of the basis
+            build: a callable returning the basis matrix
+
+        Returns:
+            X: the read-only basis matrix
+        """
+        terms = np.asarray(terms)
+        key = (fingerprint(x), terms.shape, terms.tobytes(), np.dtype(dtype).name)
+        if key in self._entries:
+            self.hits += 1
+            self._entries.move_to_end(key)
+            return self._entries[key]
+        self.misses += 1
+        X = build()
+        X.setflags(write=False)
+        if X.nbytes <= self.max_bytes:
+            self._entries[key] = X
+            self.nbytes += X.nbytes
+            while self.nbytes > self.max_bytes:
+                _, old = self._entries.popitem(last=False)
+                self.nbytes -= old.nbytes
+                self.evictions += 1
+        return X
+
+    def clear(self):
+        """Drop all entries, the statistics are kept."""
+        self._entries.clear()
+        self.nbytes = 0
+
+    def stats(self)->dict:
+        """The hit, miss and eviction counts and the memory in use."""
+        return {"hits": self.hits, "misses": self.misses, "evictions": self.evictions,
+                "entries": len(self), "nbytes": self.nbytes}
@@ -0,0 +1,66 @@
+'''
+Copyright 2026 Microwave System Lab or its affiliates. All Rights Reserved.
+File: correlation.py
+Authors:
+agent, agent@local
+
+Description:
+The normal equations of the MP model from short-lag correlations, without
+building the basis matrix.
+
+Column (m, k) of the MP basis is the branch signal b_k = x*|x|^k delayed by
+m samples. On a periodic signal every entry of X^H X only depends on the
+difference of the two delays,
+
+    (X^H X)[(m1, k1), (m2, k2)] = R_{m2-m1}[k1, k2]
+    R_l[k1, k2] = sum_n conj(b_k1(n)) * b_k2(n-l),    R_{-l} = R_l^H
+
+and X^H y holds the cross-correlations of the branches with y at the lags
+0..M. The M+1 lagged (K+1) x (K+1) correlation matrices cost O(N*K^2*M)
+and only the K+1 branch signals are kept in memory, instead of the N x P
+basis matrix.
+
+Revision history:
+Version   Date        Author      Changes
+1.0    2026-10-17    agent       initial version
+'''
+import numpy as np
+from . import basis
+
+
+def mp_gram(x: np.ndarray, y: np.ndarray, M, K, dtype=np.complex128, accumulate=None)->tuple:
+    """
+    The MP normal equations of a periodic signal, equal to
+    solver.gram(basis.mp_basis(x, M, K), y).
+
+    Args:
+        x: the PA input signal
+        y: the target signal
+        M: memory depth
+        K: non-linearity order
+        dtype: np.complex128, or np.complex64 to build the branches in single precision
+        accumulate: the dtype to correlate in, e.g. np.complex128
+
+    Returns:
+        G: the ((M+1)*(K+1), (M+1)*(K+1)) Hermitian Gram matrix
+        b: the ((M+1)*(K+1),) projection of y onto the basis
+    """
+    accumulate = np.result_type(dtype, accumulate or dtype)
+    xp = basis._clean(basis.circular_pad(x, M, 0), dtype)
+    N = len(xp) - M
+    # branch[k, j] = b_k(j-M), so b_k(n-l) is branch[k, M+n-l]
+    branch = (xp * basis.power_table(np.abs(xp), K)).astype(accumulate, copy=False)
+    current = np.conjugate(branch[:, M:])
+    y = np.ravel(y).astype(accumulate)
+    R = np.empty((M+1, K+1, K+1), dtype=accumulate)
+    b = np.empty((M+1, K+1), dtype=accumulate)
+    for l in range(M+1):
+        delayed = branch[:, M-l:M-l+N]
+        R[l] = current @ delayed.T
+        b[l] = np.conjugate(delayed) @ y
+    G = np.empty((M+1, K+1, M+1, K+1), dtype=accumulate)
+    for m1 in range(M+1):
+        for m2 in range(M+1):
+            G[m1, :, m2] = R[m2-m1] if m2 >= m1 else np.conjugate(R[m1-m2].T)
+    P = (M+1)*(K+1)
+    return G.reshape(P, P), b.reshape(P)
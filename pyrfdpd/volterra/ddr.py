@@ -0,0 +1,201 @@
+'''
+Copyright 2026 Microwave System Lab or its affiliates. All Rights Reserved.
+File: ddr.py
+Authors:
+agent, agent@local
+
+Description:
+The Dynamic Deviation Reduction (DDR) Volterra model extraction and
+evaluation functions.
+
+The DDR series keeps the Volterra kernels up to the nonlinearity order K,
+but only the terms with at most R "dynamic" factors, i.e. delayed samples
+x(n-i) or x*(n-i) with 1 <= i <= M. Every term of the complex baseband
+series has the form
+
+    x(n)^A * x*(n)^B * z_1(n-i_1) * ... * z_r(n-i_r),   r <= R
+
+with z_j either x or x*, one more unconjugated than conjugated factor in
+total and an odd total order 2k+1 <= K. The cross-memory products, e.g.
+x(n)^2 * x*(n-1), are what GMP cannot express, while the truncation to R
+keeps the size polynomial in M instead of exponential in K.
+
+A term table is an integer array of shape (P, 2+2*R), one row
+[A, B, i_1, c_1, ..., i_R, c_R] per basis column, c_j = 1 marking a
+conjugated factor and i_j = 0 an unused slot. The dynamic factors of a row
+are sorted, so a term shares its product of the first r-1 factors with
+other terms. The builder keeps these products and the static parts
+x(n)^A * x*(n)^B in a cache while it walks the table, which costs one or
+two complex multiplications per column and per sample. Only the products
+of fewer than R factors are cached, each until the last row using it, so
+the cache holds at most about (2M)^(R-1) columns besides the (K+1)/2
+static parts.
+
+Refer to following paper for more information:
+[1] A. Zhu, J. C. Pedro and T. J. Brazil, "Dynamic Deviation Reduction-Based
+    Volterra Behavioral Modeling of RF Power Amplifiers", IEEE Trans. MTT, 2006
+
+Revision history:
+Version   Date        Author      Changes
+1.0    2026-10-17    agent       initial version
+'''
+import itertools
+import numpy as np
+from . import basis
+from .solver import solve
+
+
+def ddr_terms(K, M, R)->np.ndarray:
+    """
+    The term table of the DDR model, sorted by order, then dynamic order.
+
+    Args:
+        K: non-linearity order, odd, the terms have the orders 1, 3, ..., K
+        M: memory depth of the dynamic factors
+        R: dynamic order, the largest number of delayed factors of a term
+
+    Returns:
+        terms: integer array of shape (P, 2+2*R), see the module description
+    """
+    assert int(K) == K and K >= 1 and K % 2 == 1, "The non-linearity order should be a positive odd integer."
+    assert int(M) == M and M >= 0, "The memory depth should be a non-negative integer."
+    assert int(R) == R and R >= 0, "The dynamic order should be a non-negative integer."
+    factors = [(i, c) for i in range(1, M+1) for c in (0, 1)]
+    terms = []
+    for order in range(1, K+1, 2):
+        for r in range(0, min(R, order)+1):
+            for dynamic in itertools.combinations_with_replacement(factors, r):
+                conj = sum(c for _, c in dynamic)
+                A, B = (order+1)//2 - (r-conj), (order-1)//2 - conj
+                if A >= 0 and B >= 0:
+                    slots = list(itertools.chain(*dynamic)) + [0, 0]*(R-r)
+                    terms.append([A, B] + slots)
+    return np.array(terms, dtype=int).reshape(-1, 2+2*R)
+
+def _columns(xp, terms, M, positions, dtype):
+    # yields the basis columns in table order, caching the shared products
+    def shift(i):
+        return xp[M-i:M-i+N] if positions is None else xp[positions-i]
+    def factor(i, c):
+        return np.conjugate(shift(i)) if c else shift(i)
+    N = len(xp) - M if positions is None else len(positions)
+    R = (terms.shape[1] - 2) // 2
+    keys = [tuple((int(i), int(c)) for i, c in row[2:].reshape(-1, 2) if i > 0) for row in terms]
+    # only the products of fewer than R factors can be shared as prefixes,
+    # and each is dropped after the last row using it
+    last = {}
+    for q, key in enumerate(keys):
+        for r in range(1, min(len(key), R-1)+1):
+            last[key[:r]] = q
+    x0 = shift(0)
+    a2 = np.abs(x0)**2
+    static, dynamic = {}, {(): None}
+    for q, (row, key) in enumerate(zip(terms, keys)):
+        A, B = int(row[0]), int(row[1])
+        if (A, B) not in static:
+            # x^A x*^B = |x|^(2 min(A, B)) * x^(A-B) or x*^(B-A)
+            part = a2**min(A, B) * (x0**(A-B) if A >= B else np.conjugate(x0)**(B-A))
+            static[A, B] = part.astype(dtype, copy=False)
+        for r in range(1, min(len(key), R-1)+1):
+            if key[:r] not in dynamic:
+                prev = dynamic[key[:r-1]]
+                z = factor(*key[r-1])
+                dynamic[key[:r]] = z if prev is None else prev * z
+        if key and len(key) == R:
+            # a full product is a leaf, built for this column only
+            prev = dynamic[key[:-1]]
+            z = factor(*key[-1])
+            product = z if prev is None else prev * z
+        else:
+            product = dynamic[key]
+        column = static[A, B]
+        yield column if product is None else column * product
+        for r in range(1, min(len(key), R-1)+1):
+            if last[key[:r]] == q:
+                del dynamic[key[:r]]
+
+def ddr_basis_padded(xp: np.ndarray, terms: np.ndarray, M, rows: np.ndarray=None, dtype=np.complex128)->np.ndarray:
+    """
+    Build the DDR basis matrix of a signal padded with M history samples.
+
+    Args:
+        xp: the padded PA input signal, of length N+M
+        terms: the term table, see ddr_terms
+        M: memory depth, the padding in front of the signal
+        rows: build only these rows, e.g. from pyrfdpd.volterra.selection
+        dtype: np.complex128, or np.complex64 for half the memory traffic
+
+    Returns:
+        X: the (N, P) basis matrix, or (len(rows), P)
+    """
+    xp = basis._clean(xp, dtype)
+    positions = None if rows is None else np.asarray(rows) + M
+    N = len(xp) - M if rows is None else len(positions)
+    X = np.empty((N, len(terms)), dtype=dtype, order='F')
+    for q, column in enumerate(_columns(xp, terms, M, positions, dtype)):
+        X[:, q] = column
+    return X
+
+def ddr_basis(x: np.ndarray, K, M, R, rows: np.ndarray=None, dtype=np.complex128)->np.ndarray:
+    """
+    Build the DDR basis matrix of a periodic signal.
+    """
+    return ddr_basis_padded(basis.circular_pad(x, M, 0), ddr_terms(K, M, R), M, rows, dtype)
+
+def DDR_e(x_target: np.ndarray, y_target: np.ndarray, K, M, R, ratio=1, *, solver="cholesky", lam=1e-6,
+          dtype=np.complex128, accumulate=None, rows: np.ndarray=None)->np.ndarray:
+    """
+    The DDR coefficient extraction.
+
+    Args:
+        x_target: the PA input signal
+        y_target: the measured PA output signal
+        K: non-linearity order, odd
+        M: memory depth
+        R: dynamic order
+        ratio: ratio of samples for extraction
+        solver: least-squares backend, "cholesky", "lstsq", "ridge", "pinv",
+                "cg" or "lsqr", see pyrfdpd.volterra.solver
+        lam: regularization of the normal equations
+        dtype: np.complex128, or np.complex64 to build the basis in single precision
+        accumulate: the dtype to form the normal equations in, e.g. np.complex128
+        rows: the sample indices to extract on instead of the first ratio*N
+              samples, see pyrfdpd.volterra.selection
+
+    Returns:
+        coef: the extracted coefficients, ordered as ddr_terms(K, M, R)
+    """
+    assert(len(x_target) == len(y_target)), "The length of x and y should be the same."
+    if rows is not None:
+        X = ddr_basis(np.ravel(x_target), K, M, R, rows, dtype)
+        return solve(X, np.ravel(y_target)[rows], solver, lam, accumulate)
+    N = int(ratio * len(x_target))
+    x_target = np.ravel(x_target)[:N]
+    y_target = np.ravel(y_target)[:N]
+    X = ddr_basis(x_target, K, M, R, dtype=dtype)
+    return solve(X, y_target, solver, lam, accumulate)
+
+def DDR_v(x_target: np.ndarray, coef: np.ndarray, K, M, R, dtype=np.complex128)->np.ndarray:
+    """
+    The DDR evaluation on a periodic signal. The columns are accumulated as
+    they are built, so only the cached shared products are stored besides
+    the output, see the module description.
+
+    Args:
+        x_target: the PA input signal to be pre-distorted
+        coef: the extracted coefficients
+        K: non-linearity order, odd
+        M: memory depth
+        R: dynamic order
+        dtype: np.complex128, or np.complex64 to evaluate in single precision
+
+    Returns:
+        y: the model output
+    """
+    terms = ddr_terms(K, M, R)
+    assert len(coef) == len(terms), "The number of coefficients does not match the model structure."
+    xp = basis._clean(basis.circular_pad(x_target, M, 0), dtype)
+    y = np.zeros(len(xp) - M, dtype=dtype)
+    for c, column in zip(np.asarray(coef, dtype=dtype), _columns(xp, terms, M, None, dtype)):
+        y += c * column
+    return y
@@ -0,0 +1,145 @@
+'''
+Copyright 2026 Microwave System Lab or its affiliates. All Rights Reserved.
+File: feedback.py
+Authors:
+agent, agent@local
+
+Description:
+Coefficient extraction from reduced-rate feedback, i.e. an observation
+receiver capturing `factor` times fewer samples than the transmit path.
+
+The regressor signal x, e.g. the PA input of a PA model or of a direct
+learning DPD, is known at the full rate, only the observed target y is
+reduced:
+
+    subsample:   y holds every factor-th sample, y_obs[n] = y[offset + n*factor].
+                 The basis rows at those instants are built at the full rate,
+                 with their full memory context, and fitted against y_obs.
+    bandlimited: y is observed through a brickwall low-pass of 1/factor of the
+                 sampling bandwidth and decimated by factor. The same filter
+                 and decimation are applied to every full-rate basis column,
+                 which keeps the regression exact, since the filter is linear.
+                 Only the branch signals x(j) * |x(j-d)|^p of the term table
+                 are transformed at the full rate, every column being one of
+                 them delayed by ds, i.e. a phase ramp on the kept bins, see
+                 bandlimit_basis.
+
+Both modes fit on N/factor equations instead of N. The signals are treated as
+periodic, matching MP_e/GMP_e, so the filter is applied in the frequency
+domain. Use observe() to simulate the feedback from a full-rate capture.
+
+Revision history:
+Version   Date        Author      Changes
+1.0    2026-10-17    agent       initial version
+'''
+import numpy as np
+import scipy.fft
+from . import basis
+from .solver import solve
+
+MODES = ("subsample", "bandlimited")
+
+
+def bandlimit(a: np.ndarray, factor)->np.ndarray:
+    """
+    Brickwall low-pass a periodic signal, or the columns of a matrix, to
+    1/factor of the sampling bandwidth and decimate it by factor.
+
+    Args:
+        a: the (N,) signal or (N, P) matrix, N a multiple of factor
+        factor: the decimation factor
+
+    Returns:
+        a_obs: the (N/factor,) signal or (N/factor, P) matrix
+    """
+    bins = _bins(len(a), factor)
+    return np.fft.ifft(np.fft.fft(a, axis=0)[bins], axis=0) / factor
+
+def _bins(N, factor):
+    # the n = N/factor lowest frequency bins, in the order seen at the reduced rate
+    assert N % factor == 0, "The signal length should be a multiple of the decimation factor."
+    n = N // factor
+    return np.concatenate([np.arange((n+1)//2), np.arange(N-n//2, N)])
+
+def bandlimit_basis(x: np.ndarray, terms: np.ndarray, factor, dtype=np.complex128)->np.ndarray:
+    """
+    The basis matrix of a periodic signal, low-passed and decimated as in
+    bandlimit, without building it at the full rate. It costs one full-rate
+    FFT per branch, K+1 for MP, and (N/factor, P) memory.
+
+    Args:
+        x: the (N,) signal, N a multiple of factor
+        terms: the (P, 3) term table
+        factor: the decimation factor
+        dtype: the dtype of the returned matrix
+
+    Returns:
+        X_obs: the (N/factor, P) matrix, equal to bandlimit(basis.term_basis(x, terms), factor)
+    """
+    x = basis._clean(np.ravel(x))
+    terms = np.asarray(terms)
+    N = len(x)
+    bins = _bins(N, factor)
+    a = np.abs(x)
+    ds, de, p = terms.T
+    ramps = {int(s): np.exp(-2j*np.pi*bins*s/N) for s in np.unique(ds)}
+    spectrum = np.empty((len(bins), len(terms)), dtype=np.complex128, order='F')
+    for d, power in set(zip(de - ds, p)):
+        # the branch x(j) * |x(j-d)|^p, the terms of the branch being its delays ds
+        branch = scipy.fft.fft(x * np.roll(a, d)**power)[bins]
+        for q in np.flatnonzero((de - ds == d) & (p == power)):
+            np.multiply(branch, ramps[int(ds[q])], out=spectrum[:, q])
+    spectrum = scipy.fft.ifft(spectrum, axis=0, overwrite_x=True)
+    spectrum /= factor
+    return spectrum.astype(dtype, copy=False)
+
+def observe(y: np.ndarray, factor, mode="subsample", offset=0)->np.ndarray:
+    """
+    Simulate the reduced-rate feedback of a full-rate capture.
+
+    Args:
+        y: the full-rate PA output signal
+        factor: the rate reduction
+        mode: "subsample" or "bandlimited", see the module description
+        offset: the first captured sample of "subsample"
+
+    Returns:
+        y_obs: the observed signal, of length len(y)/factor
+    """
+    assert mode in MODES, f"Unknown mode {mode}, use one of {MODES}."
+    assert 0 <= offset < factor, "The offset should be in [0, factor)."
+    y = np.ravel(y)
+    if mode == "subsample":
+        return y[offset::factor][:len(y)//factor]
+    return bandlimit(y, factor)
+
+def extract(x: np.ndarray, y_obs: np.ndarray, terms: np.ndarray, factor, mode="subsample", offset=0,
+            solver="cholesky", lam=1e-6, dtype=np.complex128, accumulate=None)->np.ndarray:
+    """
+    Extract the coefficients from full-rate regressors and reduced-rate feedback.
+
+    Args:
+        x: the full-rate signal the basis is built on, of length N
+        y_obs: the observed target, of length N/factor, see observe
+        terms: the (P, 3) term table, e.g. basis.mp_terms(M, K)
+        factor: the rate reduction
+        mode: "subsample" or "bandlimited", see the module description
+        offset: the first captured sample of "subsample"
+        solver: least-squares backend, see pyrfdpd.volterra.solver
+        lam: regularization of the normal equations
+        dtype: np.complex128, or np.complex64 to build the basis in single precision
+        accumulate: the dtype to form the normal equations in, e.g. np.complex128
+
+    Returns:
+        coef: the extracted coefficients, ordered as the term table
+    """
+    assert mode in MODES, f"Unknown mode {mode}, use one of {MODES}."
+    assert 0 <= offset < factor, "The offset should be in [0, factor)."
+    x, y_obs = np.ravel(x), np.ravel(y_obs)
+    assert len(y_obs) == len(x) // factor, "The feedback should hold len(x)/factor samples."
+    if mode == "subsample":
+        rows = offset + factor*np.arange(len(y_obs))
+        X = basis.term_basis_rows(x, terms, rows, dtype)
+    else:
+        X = bandlimit_basis(x, terms, factor, dtype)
+    return solve(X, y_obs, solver, lam, accumulate)
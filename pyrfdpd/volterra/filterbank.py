@@ -0,0 +1,73 @@
+'''
+Copyright 2026 Microwave System Lab or its affiliates. All Rights Reserved.
+File: filterbank.py
+Authors:
+agent, agent@local
+
+Description:
+FIR filter-bank evaluation of the MP and GMP models.
+
+Grouping the terms x(n-ds) * |x(n-de)|^p of a term table by the offset
+d = de - ds and the power p gives the nonlinear branch signals
+
+    b_{d,p}(j) = x(j) * |x(j-d)|^p
+
+and the model output is a short multi-channel FIR filter over them, the taps
+being the signal delays ds:
+
+    y(n) = sum_{d,p} sum_{ds} coef(ds, d, p) * b_{d,p}(n-ds)
+
+For MP there is a single offset d = 0 and K+1 branches x*|x|^k, filtered
+with the M+1 taps coef[m*(K+1)+k]. Only the branch signals are kept in
+memory instead of the full N x P basis matrix, which is M+1 times smaller
+for MP.
+
+Revision history:
+Version   Date        Author      Changes
+1.0    2026-10-17    agent       initial version
+'''
+import numpy as np
+from . import basis
+
+
+def filter_padded(xp: np.ndarray, terms: np.ndarray, coef: np.ndarray, dtype=np.complex128)->np.ndarray:
+    """
+    Evaluate a model on a signal padded by `basis.term_depth(terms)`.
+
+    Args:
+        xp: the padded PA input signal, of length lag+N+lead
+        terms: the (P, 3) term table
+        coef: the (P,) coefficients
+        dtype: np.complex128, or np.complex64 for half the memory traffic
+
+    Returns:
+        y: the (N,) model output
+    """
+    terms = np.asarray(terms)
+    lag, lead = basis.term_depth(terms)
+    xp = basis._clean(xp, dtype)
+    coef = np.asarray(coef, dtype=dtype)
+    N = len(xp) - lag - lead
+    ds, de, p = terms.T
+    table = basis.power_table(np.abs(xp), int(p.max()) if len(terms) else 0)
+    y = np.zeros(N, dtype=dtype)
+    offsets = de - ds
+    for d in np.unique(offsets):
+        group = offsets == d
+        powers, p_index = np.unique(p[group], return_inverse=True)
+        taps, s_index = np.unique(ds[group], return_inverse=True)
+        # branch[i, j-lo] = x(j) * |x(j-d)|^powers[i] for every j where both exist
+        lo, hi = max(d, 0), len(xp) + min(d, 0)
+        branch = xp[lo:hi] * table[powers, lo-d:hi-d]
+        C = np.zeros((len(taps), len(powers)), dtype=dtype)
+        C[s_index, p_index] = coef[group]
+        for i, s in enumerate(taps):
+            start = lag - s - lo
+            y += C[i] @ branch[:, start:start+N]
+    return y
+
+def filter_circular(x: np.ndarray, terms: np.ndarray, coef: np.ndarray, dtype=np.complex128)->np.ndarray:
+    """
+    Evaluate a model on a periodic signal.
+    """
+    return filter_padded(basis.circular_pad(x, *basis.term_depth(terms)), terms, coef, dtype)
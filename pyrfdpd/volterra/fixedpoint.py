@@ -0,0 +1,185 @@
+'''
+Copyright 2026 Microwave System Lab or its affiliates. All Rights Reserved.
+File: fixedpoint.py
+Authors:
+agent, agent@local
+
+Description:
+Bit-true fixed-point evaluation of the MP/GMP models as deployed on a
+fixed-point datapath, vectorized over the samples with integer NumPy
+arithmetic.
+
+A value in the format (W, F) is a signed W-bit integer v standing for
+v / 2^F. The datapath of every term x(n-ds) * |x(n-de)|^p is
+
+    x      input, quantized to `input`
+    |x|    envelope, the magnitude of the quantized input rounded to `envelope`
+    |x|^p  repeated products with the envelope, rounded to `envelope`
+    term   x(n-ds) * |x(n-de)|^p, rounded to `product`, the p = 0 terms
+           being x(n-ds) itself, rounded to `product` without a multiply
+    acc    sum of term * coef at full precision, in a saturating
+           `accumulator`-bit register, coef quantized to `coef`
+    y      the accumulator rounded to `output`
+
+Every rounding uses the `rounding` mode of the spec, "floor" (truncation),
+"nearest" (half up) or "convergent" (half even), and every result saturates
+at the range of its format. Complex values are held as separate real and
+imaginary integer arrays.
+
+Example:
+    spec = volterra.fixedpoint.Spec(coef=(18, 14))
+    y = volterra.fixedpoint.evaluate(x, model.terms, model.coef, spec)
+    volterra.fixedpoint.export("coef.txt", model.terms, model.coef, spec)
+
+Revision history:
+Version   Date        Author      Changes
+1.0    2026-10-17    agent       initial version
+'''
+import numpy as np
+from . import basis
+
+ROUNDING = ("floor", "nearest", "convergent")
+
+
+class Spec:
+    """
+    The word lengths and rounding of the fixed-point datapath.
+
+    Args:
+        input: (W, F) of the input samples
+        envelope: (W, F) of |x| and its powers
+        product: (W, F) of the terms x * |x|^p
+        coef: (W, F) of the coefficients
+        accumulator: the word length of the accumulator, its fraction being
+                     the product and coef fractions together
+        output: (W, F) of the output samples
+        rounding: "floor", "nearest" or "convergent"
+    """
+
+    def __init__(self, input=(16, 14), envelope=(18, 16), product=(18, 15), coef=(18, 14),
+                 accumulator=48, output=(16, 14), rounding="nearest"):
+        assert rounding in ROUNDING, f"Unknown rounding {rounding}, use one of {ROUNDING}."
+        self.input, self.envelope, self.product = tuple(input), tuple(envelope), tuple(product)
+        self.coef, self.output = tuple(coef), tuple(output)
+        self.accumulator = (accumulator, product[1] + coef[1])
+        self.rounding = rounding
+        assert self.accumulator[0] <= 62, "The accumulator does not fit int64 arithmetic."
+        assert max(input[0] + envelope[0], envelope[0] * 2, product[0] + coef[0]) <= 62, \
+            "The products do not fit int64 arithmetic."
+
+    def __repr__(self):
+        return (f"Spec(input={self.input}, envelope={self.envelope}, product={self.product}, "
+                f"coef={self.coef}, accumulator={self.accumulator[0]}, output={self.output}, "
+                f"rounding={self.rounding!r})")
+
+
+def saturate(v: np.ndarray, fmt)->np.ndarray:
+    """Clip integers to the range of a (W, F) format."""
+    W = fmt[0]
+    return np.clip(v, -(1 << (W-1)), (1 << (W-1)) - 1)
+
+def shift(v: np.ndarray, n, rounding="nearest")->np.ndarray:
+    """Divide integers by 2^n with rounding, n >= 0."""
+    if n <= 0:
+        return v << -n
+    if rounding == "floor":
+        return v >> n
+    half = 1 << (n-1)
+    if rounding == "nearest":
+        return (v + half) >> n
+    # convergent: ties go to the even neighbour
+    q = (v + half) >> n
+    tie = (v & ((1 << n) - 1)) == half
+    return np.where(tie & (q & 1 == 1), q - 1, q)
+
+def quantize(a: np.ndarray, fmt, rounding="nearest")->np.ndarray:
+    """
+    Quantize real values to saturated integers of a (W, F) format.
+    """
+    u = np.asarray(a, dtype=float) * 2.0**fmt[1]
+    if rounding == "floor":
+        v = np.floor(u)
+    elif rounding == "nearest":
+        v = np.floor(u + 0.5)
+    else:
+        v = np.round(u)  # numpy rounds ties to even
+    return saturate(v.astype(np.int64), fmt)
+
+def quantize_complex(a: np.ndarray, fmt, rounding="nearest")->tuple:
+    """
+    Quantize complex values, returning the integer (real, imag) pair.
+    """
+    a = np.asarray(a)
+    return quantize(a.real, fmt, rounding), quantize(a.imag, fmt, rounding)
+
+def dequantize(re: np.ndarray, im: np.ndarray, fmt)->np.ndarray:
+    """The complex values of integer (real, imag) pairs of a (W, F) format."""
+    return (re + 1j*im) / 2.0**fmt[1]
+
+def quantize_coef(coef: np.ndarray, spec: Spec)->np.ndarray:
+    """
+    The coefficients as the datapath sees them, e.g. to measure the
+    coefficient quantization alone.
+    """
+    return dequantize(*quantize_complex(coef, spec.coef, spec.rounding), spec.coef)
+
+def evaluate_padded(xp: np.ndarray, terms: np.ndarray, coef: np.ndarray, spec: Spec, raw=False):
+    """
+    Bit-true evaluation on a signal padded by `basis.term_depth(terms)`.
+
+    Args:
+        xp: the padded PA input signal, of length lag+N+lead
+        terms: the (P, 3) term table
+        coef: the (P,) floating-point coefficients, quantized by spec.coef
+        spec: the datapath Spec
+        raw: return the output integers instead of their values
+
+    Returns:
+        y: the (N,) output, or the integer (real, imag) pair if raw
+    """
+    terms = np.asarray(terms)
+    lag, lead = basis.term_depth(terms)
+    rounding = spec.rounding
+    xr, xi = quantize_complex(basis._clean(xp), spec.input, rounding)
+    N = len(xr) - lag - lead
+    # the magnitude of the quantized input, in the envelope format
+    a = np.sqrt(xr.astype(float)**2 + xi.astype(float)**2) / 2.0**spec.input[1]
+    env = [None, quantize(a, spec.envelope, rounding)]
+    for p in range(2, int(terms[:, 2].max()) + 1 if len(terms) else 0):
+        env.append(saturate(shift(env[-1] * env[1], spec.envelope[1], rounding), spec.envelope))
+    cr, ci = quantize_complex(coef, spec.coef, rounding)
+    # term = x * env has input+envelope fraction bits, rounded to product
+    to_product = spec.input[1] + spec.envelope[1] - spec.product[1]
+    # the linear terms skip the multiply by 1, which the envelope format may not hold
+    linear = [saturate(shift(v, spec.input[1] - spec.product[1], rounding), spec.product) for v in (xr, xi)]
+    acc_r = np.zeros(N, dtype=np.int64)
+    acc_i = np.zeros(N, dtype=np.int64)
+    for (ds, de, p), c_r, c_i in zip(terms, cr, ci):
+        if p == 0:
+            tr, ti = linear[0][lag-ds:lag-ds+N], linear[1][lag-ds:lag-ds+N]
+        else:
+            e = env[p][lag-de:lag-de+N]
+            tr = saturate(shift(xr[lag-ds:lag-ds+N] * e, to_product, rounding), spec.product)
+            ti = saturate(shift(xi[lag-ds:lag-ds+N] * e, to_product, rounding), spec.product)
+        acc_r = saturate(acc_r + tr*c_r - ti*c_i, spec.accumulator)
+        acc_i = saturate(acc_i + tr*c_i + ti*c_r, spec.accumulator)
+    to_output = spec.accumulator[1] - spec.output[1]
+    yr = saturate(shift(acc_r, to_output, rounding), spec.output)
+    yi = saturate(shift(acc_i, to_output, rounding), spec.output)
+    return (yr, yi) if raw else dequantize(yr, yi, spec.output)
+
+def evaluate(x: np.ndarray, terms: np.ndarray, coef: np.ndarray, spec: Spec, raw=False):
+    """
+    Bit-true evaluation on a periodic signal, the fixed-point counterpart of
+    MP_v/GMP_v, see evaluate_padded.
+    """
+    return evaluate_padded(basis.circular_pad(x, *basis.term_depth(np.asarray(terms))), terms, coef, spec, raw)
+
+def export(file, terms: np.ndarray, coef: np.ndarray, spec: Spec):
+    """
+    Write the quantized coefficients as a text table, one "ds de p real imag"
+    row of integers per term, the formats being listed in the header.
+    """
+    cr, ci = quantize_complex(coef, spec.coef, spec.rounding)
+    table = np.column_stack([np.asarray(terms), cr, ci])
+    np.savetxt(file, table, fmt="%d", header=f"{spec}\nds de p real imag")
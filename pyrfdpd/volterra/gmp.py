@@ -3,6 +3,7 @@ Copyright 2023 Microwave System Lab or its affiliates. All Rights Reserved.
 File: gmp.py
 Authors:
 Zhe Li, 904016301@qq.com
+agent, agent@local
 
 Description:
 The Generalized Memory Polynomial (GMP) model extraction and evaluation functions. 
@@ -10,15 +11,28 @@ The Generalized Memory Polynomial (GMP) model extraction and evaluation function
 Revision histry:
 Version   Date        Author      Changes
 1.0    2024-1-18    Zhe Li      initial version
+1.1    2026-10-17    agent       solver backends, dtype, row selection, operator
+                                 method, basis cache, batch, stream and
+                                 feedback extraction, FIR evaluation,
+                                 GMPModel
 '''
 from matplotlib import legend
 import numpy as np
 import scipy.io
 import matplotlib.pyplot as plt
 import argparse
-
-
-def GMP_e(x_target: np.ndarray, y_target: np.ndarray, K: list, L: list, M: list, ratio: float=1)->np.ndarray:
+from . import basis
+from . import batch
+from . import feedback
+from . import filterbank
+from .solver import BasisOperator, solve
+from .streaming import StreamingExtractor
+from .model import VolterraModel
+
+
+def GMP_e(x_target: np.ndarray, y_target: np.ndarray, K: list, L: list, M: list, ratio: float=1, *, solver="cholesky",
+          lam=1e-6, dtype=np.complex128, accumulate=None, rows: np.ndarray=None, method="basis", cache=None,
+          x0: np.ndarray=None, tol=1e-8, maxiter=None)->np.ndarray:
     """
     This is the coefficient extraction file based on GMP DPD
     designed by Qianyun Lu, Oct 12, 2019, qianyun.lu@seu.edu.cn
@@ -32,50 +46,109 @@ def GMP_e(x_target: np.ndarray, y_target: np.ndarray, K: list, L: list, M: list,
         L: lagging depth, three terms
         M: memory depth, two terms
         ratio: ratio of samples for extraction
+        solver: least-squares backend, "cholesky", "lstsq", "ridge", "pinv",
+                "cg" or "lsqr", see pyrfdpd.volterra.solver
+        lam: regularization of the normal equations
+        dtype: np.complex128, or np.complex64 to build the basis in single precision
+        accumulate: the dtype to form the normal equations in, e.g. np.complex128
+        rows: the sample indices to extract on instead of the first ratio*N
+              samples, e.g. from pyrfdpd.volterra.selection.select, each
+              keeping its memory context in the whole signal, method "basis" only
+        method: "basis" builds the basis matrix, "operator" rebuilds it chunk
+                by chunk on every pass of the solvers "cg" or "lsqr" instead
+                of storing it
+        cache: a pyrfdpd.volterra.cache.BasisCache to reuse the basis of
+               signals seen before, only with method "basis" and no rows
+        x0: the initial guess of the iterative solvers "cg" and "lsqr", e.g.
+            the coefficients of the previous DPD iteration
+        tol: the relative tolerance of the iterative solvers
+        maxiter: the iteration cap of the iterative solvers
 
     Returns:
-        coef: the extracted coefficients
+        coef: the extracted coefficients, ordered as the basis columns
+              documented in pyrfdpd.volterra.basis
     """
     assert(len(x_target) == len(y_target)), "The length of x and y should be the same."
-    x_target = x_target[:int(ratio * len(x_target))]
-    y_target = y_target[:int(ratio * len(x_target))]
-    x_target = np.ravel(x_target) # Change from 2D to 1D array
-    y_target = np.ravel(y_target) # Change from 2D to 1D array
-    Ka, Kb, Kc = K
-    La, Lb, Lc = L
-    Mb, Mc = M
-    N = len(x_target)
-
-    X_align = np.empty((N, Ka*La), dtype='complex_')
-    for k in range(Ka):
-        for l in range(La):
-            xd = np.roll(x_target, l)
-            X_align[:, k*La+l] = xd * np.power(abs(xd), k)
-    
-    X_lag = np.empty((N, Kb*Lb*Mb), dtype='complex_')
-    for k in range(Kb):
-        for l in range(Lb):
-            for m in range(Mb):
-                xd = np.roll(x_target, l)
-                xdm = np.roll(xd, m+1)
-                X_lag[:, k*(Lb+Mb)+l*Mb+m] = xd * np.power(abs(xdm), k+1)
-    
-    X_lead = np.empty((N, Kc*Lb*Mb), dtype='complex_')
-    for k in range(Kc):
-        for l in range(Lc):
-            for m in range(Mc):
-                xd = np.roll(x_target, l)
-                xdm = np.roll(xd, -(m+1))
-                X_lead[:, k*(Lc+Mc)+l*Mc+m] = xd * np.power(abs(xdm), k+1)
-    X = np.hstack((X_align, X_lag, X_lead))
-    X[np.isnan(X)] = 0 # Remove NaN
-    XH = np.conjugate(X.T)
-    # Calculate coefficients based on equation (29), extended by +0.000001*:
+    assert cache is None or (rows is None and method == "basis"), "The cache only holds whole basis matrices."
+    assert rows is None or method == "basis", "Selected rows are built with method 'basis' only."
+    if rows is not None:
+        X = basis.term_basis_rows(x_target, basis.gmp_terms(K, L, M), rows, dtype)
+        return solve(X, np.ravel(y_target)[rows], solver, lam, accumulate, x0, tol, maxiter)
+    N = int(ratio * len(x_target))
+    x_target = np.ravel(x_target)[:N] # Change from 2D to 1D array
+    y_target = np.ravel(y_target)[:N] # Change from 2D to 1D array
+    if method == "operator":
+        X = BasisOperator(x_target, basis.gmp_terms(K, L, M), dtype)
+        return solve(X, y_target, solver, lam, x0=x0, tol=tol, maxiter=maxiter)
+    assert method == "basis", f"Unknown method {method}, use 'basis' or 'operator'."
+    if cache is not None:
+        X = cache.get(x_target, basis.gmp_terms(K, L, M), dtype, lambda: basis.gmp_basis(x_target, K, L, M, dtype))
+    else:
+        X = basis.gmp_basis(x_target, K, L, M, dtype)
+    # Calculate coefficients based on equation (29), extended by +lam*I:
     # $w=(Y^H Y)^{-1} Y^H x$, where w are the coefficients, $Y$ equals `X` and $x$ equals `y_target` in code.
-    coef = np.linalg.pinv(XH.dot(X) + 0.000001*np.eye(X.shape[1])).dot(XH).dot(y_target)
+    coef = solve(X, y_target, solver, lam, accumulate, x0, tol, maxiter)
     return coef
 
-def GMP_v(x_target: np.ndarray, coef, K: list, L: list, M: list)->np.ndarray:
+def GMP_e_stream(blocks, K: list, L: list, M: list, solver="cholesky", lam=1e-6)->np.ndarray:
+    """
+    The GMP coefficient extraction on a stream of (x, y) blocks, e.g. from
+    pyrfdpd.volterra.streaming.blocks, keeping only the normal equations in memory.
+
+    Args:
+        blocks: iterator of (PA input, PA output) blocks
+        K: non-linearity order, three terms
+        L: lagging depth, three terms
+        M: memory depth, two terms
+        solver: least-squares backend, see pyrfdpd.volterra.solver
+        lam: regularization of the normal equations
+
+    Returns:
+        coef: the extracted coefficients
+    """
+    return StreamingExtractor(basis.gmp_terms(K, L, M), solver, lam).fit(blocks)
+
+def GMP_e_batch(x_target: np.ndarray, y_target: np.ndarray, K: list, L: list, M: list, ratio: float=1, lam=1e-6, n_jobs=1, **kwargs)->np.ndarray:
+    """
+    The GMP coefficient extraction of C channels at once, e.g. the PA chains
+    of an antenna array, see pyrfdpd.volterra.batch.extract for the other arguments.
+
+    Args:
+        x_target: the (C, N) PA input signals
+        y_target: the (C, N) measured PA output signals
+        K: non-linearity order, three terms
+        L: lagging depth, three terms
+        M: memory depth, two terms
+
+    Returns:
+        coef: the (C, P) extracted coefficients
+    """
+    return batch.extract(x_target, y_target, basis.gmp_terms(K, L, M), ratio, lam, n_jobs=n_jobs, **kwargs)
+
+def GMP_e_feedback(x_target: np.ndarray, y_observed: np.ndarray, K: list, L: list, M: list, factor, mode="subsample", offset=0,
+                   solver="cholesky", lam=1e-6)->np.ndarray:
+    """
+    The GMP coefficient extraction from reduced-rate feedback, see
+    pyrfdpd.volterra.feedback.
+
+    Args:
+        x_target: the full-rate signal the basis is built on
+        y_observed: the observed target, of length len(x_target)/factor
+        K: non-linearity order, three terms
+        L: lagging depth, three terms
+        M: memory depth, two terms
+        factor: the rate reduction of the feedback
+        mode: "subsample" or "bandlimited"
+        offset: the first captured sample of "subsample"
+        solver: least-squares backend, see pyrfdpd.volterra.solver
+        lam: regularization of the normal equations
+
+    Returns:
+        coef: the extracted coefficients
+    """
+    return feedback.extract(x_target, y_observed, basis.gmp_terms(K, L, M), factor, mode, offset, solver, lam)
+
+def GMP_v(x_target: np.ndarray, coef, K: list, L: list, M: list, method="fir", dtype=np.complex128, cache=None)->np.ndarray:
     """
     This is the coefficient evaluation file based on MP DPD
     designed by Qianyun Lu, Oct. 12, 2018, qianyun.lu@seu.edu.cn
@@ -86,43 +159,61 @@ def GMP_v(x_target: np.ndarray, coef, K: list, L: list, M: list)->np.ndarray:
         K: non-linearity order
         L: lagging depth
         M: memory depth
+        method: "fir" evaluates the model as a filter bank over its branch
+                signals, "basis" builds the full basis matrix and multiplies
+        dtype: np.complex128, or np.complex64 to evaluate in single precision
+        cache: a pyrfdpd.volterra.cache.BasisCache, the basis of a signal seen
+               before is then reused and the evaluation is a single matvec
     
     Returns:
         y: the calculated model output
     """
-    N = len(x_target)
-    x_target = np.ravel(x_target) # Change from 2D to 1D array
-    Ka, Kb, Kc = K
-    La, Lb, Lc = L
-    Mb, Mc = M
-
-    X_align = np.empty((N, Ka*La), dtype='complex_')
-    for k in range(Ka):
-        for l in range(La):
-            xd = np.roll(x_target, l)
-            X_align[:, k*La+l] = xd * np.power(abs(xd), k)
-    
-    X_lag = np.empty((N, Kb*Lb*Mb), dtype='complex_')
-    for k in range(Kb):
-        for l in range(Lb):
-            for m in range(Mb):
-                xd = np.roll(x_target, l)
-                xdm = np.roll(xd, m+1)
-                X_lag[:, k*(Lb+Mb)+l*Mb+m] = xd * np.power(abs(xdm), k+1)
-    
-    X_lead = np.empty((N, Kc*Lb*Mb), dtype='complex_')
-    for k in range(Kc):
-        for l in range(Lc):
-            for m in range(Mc):
-                xd = np.roll(x_target, l)
-                xdm = np.roll(xd, -(m+1))
-                X_lead[:, k*(Lc+Mc)+l*Mc+m] = xd * np.power(abs(xdm), k+1)
-
-    X = np.hstack((X_align, X_lag, X_lead))
-    X[np.isnan(X)] = 0 # Remove NaN
+    assert method in ("fir", "basis"), "method should be fir or basis."
+    if cache is not None:
+        x_target = np.ravel(x_target)
+        X = cache.get(x_target, basis.gmp_terms(K, L, M), dtype, lambda: basis.gmp_basis(x_target, K, L, M, dtype))
+        return X @ np.asarray(coef, dtype=dtype)
+    if method == "fir":
+        return filterbank.filter_circular(x_target, basis.gmp_terms(K, L, M), coef, dtype)
+    X = basis.gmp_basis(x_target, K, L, M, dtype)
     y = X.dot(coef)
     return y
 
+class GMPModel(VolterraModel):
+    """
+    The Generalized Memory Polynomial model as a reusable object, see GMP_e
+    and GMP_v.
+
+    Args:
+        K: non-linearity order, three terms
+        L: lagging depth, three terms
+        M: memory depth, two terms
+        coef: the coefficients of an already fitted model
+        dtype: np.complex128, or np.complex64 to run in single precision
+        accumulate: the dtype to form the normal equations in, e.g. np.complex128
+        cache: a pyrfdpd.volterra.cache.BasisCache to reuse the basis of
+               signals seen before in predict
+        cache_fit: also cache the basis of the fitted signals, see VolterraModel
+
+    Example:
+        model = GMPModel([5, 5, 5], [2, 2, 2], [2, 2]).fit(pa_output, pa_input)
+        pa_input = model.predict(xorg)
+        model.save("gmp.npz")
+    """
+
+    def __init__(self, K: list, L: list, M: list, coef: np.ndarray=None, dtype=np.complex128, accumulate=None, cache=None,
+                 cache_fit=False):
+        assert len(K) == 3 and len(L) == 3 and len(M) == 2, "GMP needs three K, three L and two M terms."
+        assert all(int(v) == v and v >= 0 for v in [*K, *L, *M]), "K, L and M should be non-negative integers."
+        self.K, self.L, self.M = [int(v) for v in K], [int(v) for v in L], [int(v) for v in M]
+        super().__init__(basis.gmp_terms(self.K, self.L, self.M), coef, dtype, accumulate, cache, cache_fit)
+
+    def structure(self)->dict:
+        return {"K": self.K, "L": self.L, "M": self.M}
+
+    def basis(self, x: np.ndarray)->np.ndarray:
+        return basis.gmp_basis(x, self.K, self.L, self.M, self.dtype)
+
 if __name__ == "__main__":
     print("This is the GMP extraction and evaluation functions.")
     print("To use these function, you need a PA_data.mat file")
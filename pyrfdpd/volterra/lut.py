@@ -0,0 +1,185 @@
+'''
+Copyright 2026 Microwave System Lab or its affiliates. All Rights Reserved.
+File: lut.py
+Authors:
+agent, agent@local
+
+Description:
+Compilation of fitted MP/GMP coefficients into amplitude-indexed lookup
+tables (LUTs), the form the DPD datapath runs in hardware.
+
+Grouping the terms x(n-ds) * |x(n-de)|^p of a term table by their delay
+pair (ds, de) turns the model into a sum of complex gains
+
+    y(n) = sum_{ds,de} x(n-ds) * G_{ds,de}(|x(n-de)|)
+    G_{ds,de}(a) = sum_p coef(ds, de, p) * a^p
+
+and every gain polynomial is sampled on `size` uniformly spaced amplitudes
+over [0, amax]. The evaluation then costs one table lookup, linearly
+interpolated between two entries, per tap and sample instead of the
+explicit envelope powers. Amplitudes above amax saturate at the last entry.
+For MP the taps are the M+1 pairs (m, m).
+
+Example:
+    lut = volterra.lut.compile_lut(model.terms, model.coef, amax=np.abs(x).max())
+    print(lut.report(x))
+    y = lut.evaluate(x)
+
+Revision history:
+Version   Date        Author      Changes
+1.0    2026-10-17    agent       initial version
+'''
+import numpy as np
+from . import basis
+from . import filterbank
+
+
+class LUT:
+    """
+    The per-tap complex gain tables of a model.
+
+    Args:
+        taps: the (T, 2) (ds, de) delay pairs
+        poly: the (T, K+1) gain polynomial coefficients, poly[t, p] multiplies a^p
+        amax: the amplitude of the last table entry
+        size: the number of entries per table
+        interpolate: interpolate linearly between the entries, or take the
+                     entry below the amplitude as a plain LUT does
+        dtype: np.complex128, or np.complex64 to evaluate in single precision
+    """
+
+    def __init__(self, taps: np.ndarray, poly: np.ndarray, amax, size=256, interpolate=True, dtype=np.complex128):
+        assert size >= 2, "A LUT needs at least two entries."
+        assert amax > 0, "The amplitude range of the LUT should be positive."
+        self.taps = np.asarray(taps)
+        self.poly = np.asarray(poly)
+        self.amax = float(amax)
+        self.size = size
+        self.interpolate = interpolate
+        self.dtype = np.dtype(dtype)
+        self.lag, self.lead = basis.term_depth(np.column_stack([self.taps, np.zeros(len(self.taps), dtype=int)]))
+        self.step = self.amax / (size-1)
+        self.table = self.gain(np.linspace(0, self.amax, size)).astype(self.dtype)
+        # slope[t, i] = table[t, i+1] - table[t, i], the last entry holds the saturated gain
+        self.slope = np.zeros_like(self.table)
+        self.slope[:, :-1] = np.diff(self.table, axis=1)
+
+    def __len__(self):
+        return len(self.taps)
+
+    def __repr__(self):
+        return f"LUT(taps={len(self.taps)}, size={self.size}, amax={self.amax:g})"
+
+    def gain(self, a: np.ndarray)->np.ndarray:
+        """
+        The exact polynomial gains of all taps at the amplitudes a.
+
+        Returns:
+            G: the (T, len(a)) complex gains
+        """
+        return self.poly.dot(basis.power_table(np.ravel(a).astype(float), self.poly.shape[1]-1))
+
+    def lookup(self, a: np.ndarray)->np.ndarray:
+        """
+        The table gains of all taps at the amplitudes a, see `gain`.
+        """
+        index, frac = self._index(np.ravel(a).astype(float))
+        if not self.interpolate:
+            return self.table[:, index]
+        return self.table[:, index] + self.slope[:, index] * frac
+
+    def _index(self, a):
+        u = np.minimum(a / self.step, self.size-1)
+        index = u.astype(np.intp)
+        return index, (u - index).astype(self.dtype.char.lower())
+
+    def evaluate_padded(self, xp: np.ndarray)->np.ndarray:
+        """
+        Evaluate the tables on a signal padded by `lag` history and `lead`
+        future samples.
+
+        Args:
+            xp: the padded PA input signal, of length lag+N+lead
+
+        Returns:
+            y: the (N,) LUT output
+        """
+        xp = basis._clean(xp, self.dtype)
+        N = len(xp) - self.lag - self.lead
+        # one address and fraction per sample, shared by every tap reading it
+        index, frac = self._index(np.abs(xp))
+        y = np.zeros(N, dtype=self.dtype)
+        for t, (ds, de) in enumerate(self.taps):
+            i = index[self.lag-de:self.lag-de+N]
+            g = self.table[t, i]
+            if self.interpolate:
+                g += self.slope[t, i] * frac[self.lag-de:self.lag-de+N]
+            y += xp[self.lag-ds:self.lag-ds+N] * g
+        return y
+
+    def evaluate(self, x: np.ndarray)->np.ndarray:
+        """
+        Evaluate the tables on a periodic signal, the LUT counterpart of
+        MP_v/GMP_v.
+        """
+        return self.evaluate_padded(basis.circular_pad(x, self.lag, self.lead))
+
+    def report(self, x: np.ndarray=None, oversample=16)->dict:
+        """
+        The approximation error of the tables against the gain polynomials.
+
+        Args:
+            x: a periodic PA input signal to also measure the output error on
+            oversample: number of test amplitudes per table interval
+
+        Returns:
+            report: a dict with "max_error", the largest gain error over
+                    [0, amax], "max_error_tap", the (T,) largest gain error of
+                    every tap, "nmse_db", the gain NMSE in dB over all taps,
+                    and with x given "nmse_signal_db", the NMSE in dB of the
+                    LUT output against the polynomial model output
+        """
+        a = np.linspace(0, self.amax, (self.size-1)*oversample + 1)
+        exact = self.gain(a)
+        error = np.abs(self.lookup(a) - exact)
+        tiny = np.finfo(float).tiny
+        report = {"max_error": float(error.max()),
+                  "max_error_tap": error.max(axis=1),
+                  "nmse_db": float(10*np.log10(max(np.sum(error**2), tiny) / max(np.sum(np.abs(exact)**2), tiny)))}
+        if x is not None:
+            y = filterbank.filter_circular(x, *self.terms())
+            residual = np.sum(np.abs(self.evaluate(x) - y)**2)
+            report["nmse_signal_db"] = float(10*np.log10(max(residual, tiny) / max(np.sum(np.abs(y)**2), tiny)))
+        return report
+
+    def terms(self)->tuple:
+        """
+        The term table and coefficients of the gain polynomials.
+        """
+        t, p = np.nonzero(self.poly)
+        terms = np.column_stack([self.taps[t], p])
+        return terms, self.poly[t, p]
+
+
+def compile_lut(terms: np.ndarray, coef: np.ndarray, amax, size=256, interpolate=True, dtype=np.complex128)->LUT:
+    """
+    Compile fitted coefficients into per-tap gain LUTs.
+
+    Args:
+        terms: the (P, 3) term table, e.g. basis.mp_terms(M, K)
+        coef: the (P,) coefficients
+        amax: the amplitude of the last table entry, e.g. the peak of the
+              signals the LUT will run on
+        size: the number of entries per table
+        interpolate: interpolate linearly between the entries
+        dtype: np.complex128, or np.complex64 to evaluate in single precision
+
+    Returns:
+        lut: the compiled LUT
+    """
+    terms = np.asarray(terms)
+    assert len(terms) == len(coef), "Every term needs one coefficient."
+    taps, index = np.unique(terms[:, :2], axis=0, return_inverse=True)
+    poly = np.zeros((len(taps), int(terms[:, 2].max())+1), dtype=np.complex128)
+    np.add.at(poly, (np.ravel(index), terms[:, 2]), coef)
+    return LUT(taps, poly, amax, size, interpolate, dtype)
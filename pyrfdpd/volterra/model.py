@@ -0,0 +1,212 @@
+'''
+Copyright 2026 Microwave System Lab or its affiliates. All Rights Reserved.
+File: model.py
+Authors:
+agent, agent@local
+
+Description:
+The base class of the reusable Volterra model objects, see MPModel in mp.py
+and GMPModel in gmp.py. A model validates its structure and builds its term
+table once, and then fits, predicts and serializes without re-parsing it.
+
+Revision history:
+Version   Date        Author      Changes
+1.0    2026-10-17    agent       initial version
+'''
+import numpy as np
+from . import basis
+from . import filterbank
+from . import lut
+from . import sparse
+from .solver import ITERATIVE, solve
+from .streaming import StreamingExtractor, Predistorter
+
+_MODELS = {}
+
+
+class VolterraModel:
+    """
+    A model whose regressors are the x(n-ds) * |x(n-de)|^p terms of a term
+    table, see pyrfdpd.volterra.basis. Subclasses set `self.terms` and
+    return their structure arguments from `structure()`.
+
+    Args:
+        terms: the (P, 3) term table
+        coef: the coefficients of an already fitted model
+        dtype: np.complex128, or np.complex64 to build the basis, the normal
+               equations and the evaluation in single precision
+        accumulate: the dtype to form the normal equations in, np.complex128
+                    is recommended with complex64 since the basis is badly
+                    conditioned at high orders
+        cache: a pyrfdpd.volterra.cache.BasisCache to reuse the basis of
+               signals seen before, predict is then a single matvec
+        cache_fit: also cache the basis of the fitted signals. In the DPD
+                   loop every fit sees a new PA output, whose basis is
+                   never reused and only evicts the one of xorg.
+    """
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        _MODELS[cls.__name__] = cls
+
+    def __init__(self, terms: np.ndarray, coef: np.ndarray=None, dtype=np.complex128, accumulate=None, cache=None,
+                 cache_fit=False):
+        self.terms = np.asarray(terms)
+        self.dtype = np.dtype(dtype)
+        self.accumulate = None if accumulate is None else np.dtype(accumulate)
+        self.lag, self.lead = basis.term_depth(self.terms)
+        self.coef = None if coef is None else np.asarray(coef)
+        self.cache = cache
+        self.cache_fit = cache_fit
+
+    def __len__(self):
+        return len(self.terms)
+
+    def __repr__(self):
+        args = ", ".join(f"{k}=<{len(v)} terms>" if isinstance(v, np.ndarray) else f"{k}={v}"
+                         for k, v in self.structure().items())
+        return f"{type(self).__name__}({args})"
+
+    def structure(self)->dict:
+        """The constructor arguments of the model."""
+        return {"terms": self.terms}
+
+    def basis(self, x: np.ndarray)->np.ndarray:
+        """The basis matrix of a periodic signal."""
+        return basis.term_basis(x, self.terms, self.dtype)
+
+    def _basis(self, x, fit=False):
+        if self.cache is None or (fit and not self.cache_fit):
+            return self.basis(x)
+        return self.cache.get(x, self.terms, self.dtype, lambda: self.basis(x))
+
+    def fit(self, x: np.ndarray, y: np.ndarray, ratio=1, solver="cholesky", lam=1e-6, rows: np.ndarray=None,
+            tol=1e-8, maxiter=None):
+        """
+        Extract the coefficients from the PA input x and output y.
+
+        Args:
+            x: the PA input signal
+            y: the measured PA output signal
+            ratio: ratio of samples for extraction
+            solver: least-squares backend, see pyrfdpd.volterra.solver
+            lam: regularization of the normal equations
+            rows: the sample indices to extract on instead of the first
+                  ratio*N samples, see pyrfdpd.volterra.selection
+            tol: the relative tolerance of the iterative solvers "cg" and
+                 "lsqr", which start from the current coefficients
+            maxiter: the iteration cap of the iterative solvers
+
+        Returns:
+            self
+        """
+        assert(len(x) == len(y)), "The length of x and y should be the same."
+        # repeated fits, e.g. in the DPD loop, warm start from the last result
+        x0 = self.coef if solver in ITERATIVE else None
+        if rows is not None:
+            X = basis.term_basis_rows(x, self.terms, rows, self.dtype)
+            self.coef = solve(X, np.ravel(y)[rows], solver, lam, self.accumulate, x0, tol, maxiter)
+            return self
+        N = int(ratio * len(x))
+        self.coef = solve(self._basis(np.ravel(x)[:N], fit=True), np.ravel(y)[:N], solver, lam, self.accumulate, x0, tol, maxiter)
+        return self
+
+    def fit_sparse(self, x: np.ndarray, y: np.ndarray, n_terms=None, tol_db=None, ratio=1, lam=1e-6):
+        """
+        Select the most significant terms by orthogonal matching pursuit, see
+        pyrfdpd.volterra.sparse, and fit them.
+
+        Args:
+            x: the PA input signal
+            y: the measured PA output signal
+            n_terms: the number of terms to keep
+            tol_db: keep adding terms until the NMSE in dB is below this value
+            ratio: ratio of samples for extraction
+            lam: regularization of the normal equations
+
+        Returns:
+            model: a fitted VolterraModel with only the selected terms, whose
+                   evaluation computes only those columns
+        """
+        assert(len(x) == len(y)), "The length of x and y should be the same."
+        N = int(ratio * len(x))
+        support, coef, _ = sparse.omp(self._basis(np.ravel(x)[:N], fit=True), np.ravel(y)[:N], n_terms, tol_db, lam, self.accumulate)
+        order = np.argsort(support)
+        return VolterraModel(self.terms[support[order]], coef[order], self.dtype, self.accumulate, self.cache,
+                             self.cache_fit)
+
+    def fit_stream(self, blocks, solver="cholesky", lam=1e-6):
+        """
+        Extract the coefficients from an iterator of (x, y) blocks, see
+        pyrfdpd.volterra.streaming.
+
+        Returns:
+            self
+        """
+        self.coef = StreamingExtractor(self.terms, solver, lam, self.dtype, self.accumulate).fit(blocks)
+        return self
+
+    def predict(self, x: np.ndarray)->np.ndarray:
+        """
+        Evaluate the model on a periodic signal.
+        """
+        assert self.coef is not None, "The model has not been fitted yet."
+        if self.cache is not None:
+            return self._basis(np.ravel(x)) @ self.coef.astype(self.dtype, copy=False)
+        return filterbank.filter_circular(x, self.terms, self.coef, self.dtype)
+
+    def compile_lut(self, amax, size=256, interpolate=True)->"lut.LUT":
+        """
+        Compile the coefficients into per-tap gain LUTs, see pyrfdpd.volterra.lut.
+        """
+        assert self.coef is not None, "The model has not been fitted yet."
+        return lut.compile_lut(self.terms, self.coef, amax, size, interpolate, self.dtype)
+
+    def predictor(self, circular=False)->Predistorter:
+        """
+        A block-by-block Predistorter running this model.
+        """
+        assert self.coef is not None, "The model has not been fitted yet."
+        return Predistorter(self.terms, self.coef, circular, self.dtype)
+
+    def predict_stream(self, blocks):
+        """
+        Evaluate the model on an iterator of blocks of a continuous stream,
+        yielding the output blocks. The output lags the input by `self.lead`
+        samples, which are flushed after the last block.
+        """
+        predistorter = self.predictor()
+        for block in blocks:
+            yield predistorter.process(block)
+        if self.lead:
+            yield predistorter.flush()
+
+    def save(self, file):
+        """
+        Save the model structure and coefficients to a .npz file.
+        """
+        arrays = {k: np.asarray(v) for k, v in self.structure().items()}
+        if self.coef is not None:
+            arrays["coef"] = self.coef
+        if self.accumulate is not None:
+            arrays["accumulate"] = np.array(self.accumulate.name)
+        np.savez(file, model=np.array(type(self).__name__), dtype=np.array(self.dtype.name), **arrays)
+
+    @staticmethod
+    def load(file):
+        """
+        Load a model saved by `save`.
+        """
+        with np.load(file, allow_pickle=False) as data:
+            cls = _MODELS[str(data["model"])]
+            args = {k: data[k].tolist() for k in data.files if k not in ("model", "coef")}
+            if "terms" in args:
+                args["terms"] = data["terms"]
+            model = cls(**args)
+            if "coef" in data.files:
+                model.coef = data["coef"]
+        return model
+
+
+_MODELS[VolterraModel.__name__] = VolterraModel
+load = VolterraModel.load
@@ -3,6 +3,7 @@ Copyright 2023 Microwave System Lab or its affiliates. All Rights Reserved.
 File: mp.py
 Authors:
 Zhe Li, 904016301@qq.com
+agent, agent@local
 
 Description:
 The Memory Polynomial (MP) model extraction and evaluation functions. 
@@ -10,15 +11,29 @@ The Memory Polynomial (MP) model extraction and evaluation functions.
 Revision history:
 Version   Date        Author      Changes
 1.0    2023-11-10    Zhe Li      initial version
+1.1    2026-10-17    agent       solver backends, dtype, row selection, correlation
+                                 and operator methods, basis cache, batch,
+                                 stream and feedback extraction, FIR
+                                 evaluation, MPModel
 '''
 from matplotlib import legend
 import numpy as np
 import scipy.io
 import matplotlib.pyplot as plt
 import argparse
+from . import basis
+from . import batch
+from . import correlation
+from . import feedback
+from . import filterbank
+from .solver import NORMAL, BasisOperator, solve, solve_normal
+from .streaming import StreamingExtractor
+from .model import VolterraModel
 
 
-def MP_e(x_target: np.ndarray, y_target: np.ndarray, M, K, ratio=1)->np.ndarray:
+def MP_e(x_target: np.ndarray, y_target: np.ndarray, M, K, ratio=1, *, solver="cholesky", lam=1e-6,
+         dtype=np.complex128, accumulate=None, rows: np.ndarray=None, method="basis", cache=None,
+         x0: np.ndarray=None, tol=1e-8, maxiter=None)->np.ndarray:
     """
     This is the coefficient extraction file based on MP DPD
     designed by Qianyun Lu, Feb. 2, 2018, qianyun.lu@seu.edu.cn
@@ -30,29 +45,112 @@ def MP_e(x_target: np.ndarray, y_target: np.ndarray, M, K, ratio=1)->np.ndarray:
         x_target: the PA input signal,
         y_target: the measured PA output signal
         M: memory depth
-        K: non-linearity order,
+        K: non-linearity order
         ratio: ratio of samples for extraction
+        solver: least-squares backend, "cholesky", "lstsq", "ridge", "pinv",
+                "cg" or "lsqr", see pyrfdpd.volterra.solver
+        lam: regularization of the normal equations
+        dtype: np.complex128, or np.complex64 to build the basis in single precision
+        accumulate: the dtype to form the normal equations in, e.g. np.complex128
+        rows: the sample indices to extract on instead of the first ratio*N
+              samples, e.g. from pyrfdpd.volterra.selection.select, each
+              keeping its memory context in the whole signal, method "basis" only
+        method: "basis" builds the basis matrix, "correlation" forms the
+                normal equations from short-lag correlations without it, see
+                pyrfdpd.volterra.correlation, not with solvers "lstsq" and "lsqr" or rows,
+                "operator" rebuilds the basis chunk by chunk on every pass of
+                the solvers "cg" or "lsqr" instead of storing it
+        cache: a pyrfdpd.volterra.cache.BasisCache to reuse the basis of
+               signals seen before, only with method "basis" and no rows
+        x0: the initial guess of the iterative solvers "cg" and "lsqr", e.g.
+            the coefficients of the previous DPD iteration
+        tol: the relative tolerance of the iterative solvers
+        maxiter: the iteration cap of the iterative solvers
 
     Returns:
-        coef: the extracted coefficients
+        coef: the extracted coefficients, ordered as the basis columns
+              documented in pyrfdpd.volterra.basis
     """
     assert(len(x_target) == len(y_target)), "The length of x and y should be the same."
-    x_target = x_target[:int(ratio * len(x_target))]
-    y_target = y_target[:int(ratio * len(x_target))]
-    x_target = np.ravel(x_target) # Change from 2D to 1D array
-    y_target = np.ravel(y_target) # Change from 2D to 1D array
-    N = len(x_target)
-    x_target = np.concatenate([x_target[-M:], x_target[0:N], x_target[N:N+M]])
-    X = np.empty((N, (M+1)*(K+1)), dtype='complex_')
-    for m in range(M+1):
-        for k in range(K+1):
-            X[:, m*(K+1)+k] = x_target[M-m:M-m+N] * np.power(np.abs(x_target[M-m:M-m+N]), k)
-    X[np.isnan(X)] = 0 # Remove NaN
-    XH = np.conjugate(X.T)
-    coef = np.linalg.pinv(XH.dot(X) + 0.000001*np.eye(X.shape[1])).dot(XH).dot(y_target)
+    assert cache is None or (rows is None and method == "basis"), "The cache only holds whole basis matrices."
+    assert rows is None or method == "basis", "Selected rows are built with method 'basis' only."
+    if rows is not None:
+        X = basis.term_basis_rows(x_target, basis.mp_terms(M, K), rows, dtype)
+        return solve(X, np.ravel(y_target)[rows], solver, lam, accumulate, x0, tol, maxiter)
+    N = int(ratio * len(x_target))
+    x_target = np.ravel(x_target)[:N] # Change from 2D to 1D array
+    y_target = np.ravel(y_target)[:N] # Change from 2D to 1D array
+    if method == "correlation":
+        assert solver in NORMAL and solver != "lstsq", "The correlation method needs a normal-equation solver."
+        G, b = correlation.mp_gram(x_target, y_target, M, K, dtype, accumulate)
+        return solve_normal(G, b, solver, lam, x0, tol, maxiter)
+    if method == "operator":
+        X = BasisOperator(x_target, basis.mp_terms(M, K), dtype)
+        return solve(X, y_target, solver, lam, x0=x0, tol=tol, maxiter=maxiter)
+    assert method == "basis", f"Unknown method {method}, use 'basis', 'correlation' or 'operator'."
+    if cache is not None:
+        X = cache.get(x_target, basis.mp_terms(M, K), dtype, lambda: basis.mp_basis(x_target, M, K, dtype))
+    else:
+        X = basis.mp_basis(x_target, M, K, dtype)
+    coef = solve(X, y_target, solver, lam, accumulate, x0, tol, maxiter)
     return coef
 
-def MP_v(x_target: np.ndarray, coef: np.ndarray, M, K)->np.ndarray:
+def MP_e_stream(blocks, M, K, solver="cholesky", lam=1e-6)->np.ndarray:
+    """
+    The MP coefficient extraction on a stream of (x, y) blocks, e.g. from
+    pyrfdpd.volterra.streaming.blocks, keeping only the normal equations in memory.
+
+    Args:
+        blocks: iterator of (PA input, PA output) blocks
+        M: memory depth
+        K: non-linearity order
+        solver: least-squares backend, see pyrfdpd.volterra.solver
+        lam: regularization of the normal equations
+
+    Returns:
+        coef: the extracted coefficients
+    """
+    return StreamingExtractor(basis.mp_terms(M, K), solver, lam).fit(blocks)
+
+def MP_e_batch(x_target: np.ndarray, y_target: np.ndarray, M, K, ratio=1, lam=1e-6, n_jobs=1, **kwargs)->np.ndarray:
+    """
+    The MP coefficient extraction of C channels at once, e.g. the PA chains of
+    an antenna array, see pyrfdpd.volterra.batch.extract for the other arguments.
+
+    Args:
+        x_target: the (C, N) PA input signals
+        y_target: the (C, N) measured PA output signals
+        M: memory depth
+        K: non-linearity order
+
+    Returns:
+        coef: the (C, (M+1)*(K+1)) extracted coefficients
+    """
+    return batch.extract(x_target, y_target, basis.mp_terms(M, K), ratio, lam, n_jobs=n_jobs, **kwargs)
+
+def MP_e_feedback(x_target: np.ndarray, y_observed: np.ndarray, M, K, factor, mode="subsample", offset=0,
+                  solver="cholesky", lam=1e-6)->np.ndarray:
+    """
+    The MP coefficient extraction from reduced-rate feedback, see
+    pyrfdpd.volterra.feedback.
+
+    Args:
+        x_target: the full-rate signal the basis is built on
+        y_observed: the observed target, of length len(x_target)/factor
+        M: memory depth
+        K: non-linearity order
+        factor: the rate reduction of the feedback
+        mode: "subsample" or "bandlimited"
+        offset: the first captured sample of "subsample"
+        solver: least-squares backend, see pyrfdpd.volterra.solver
+        lam: regularization of the normal equations
+
+    Returns:
+        coef: the extracted coefficients
+    """
+    return feedback.extract(x_target, y_observed, basis.mp_terms(M, K), factor, mode, offset, solver, lam)
+
+def MP_v(x_target: np.ndarray, coef: np.ndarray, M, K, method="fir", dtype=np.complex128, cache=None)->np.ndarray:
     """
     This is the coefficient evaluation file based on MP DPD
     designed by Qianyun Lu, Feb. 2, 2018, qianyun.lu@seu.edu.cn
@@ -61,21 +159,60 @@ def MP_v(x_target: np.ndarray, coef: np.ndarray, M, K)->np.ndarray:
         x_target: the PA input signal to be pre-distorted
         coef: the extracted coefficients
         M: memory depth
-        K: non-linearity order,
+        K: non-linearity order
+        method: "fir" filters the K+1 branches x*|x|^k with the memory taps,
+                "basis" builds the full basis matrix and multiplies
+        dtype: np.complex128, or np.complex64 to evaluate in single precision
+        cache: a pyrfdpd.volterra.cache.BasisCache, the basis of a signal seen
+               before is then reused and the evaluation is a single matvec
     
     Returns:
         y: the calculated model output
     """
-    N = len(x_target)
-    x_target = np.ravel(x_target) # Change from 2D to 1D array
-    x_target = np.concatenate([x_target[-M:], x_target, x_target[0:M]])
-    X = np.empty((N, (K+1)*(M+1)), dtype='complex_')
-    for m in range(M+1):
-        for k in range(K+1):
-            X[:, m*(K+1)+k] = x_target[M-m:M-m+N] * np.power(np.abs(x_target[M-m:M-m+N]), k)
+    assert method in ("fir", "basis"), "method should be fir or basis."
+    if cache is not None:
+        x_target = np.ravel(x_target)
+        X = cache.get(x_target, basis.mp_terms(M, K), dtype, lambda: basis.mp_basis(x_target, M, K, dtype))
+        return X @ np.asarray(coef, dtype=dtype)
+    if method == "fir":
+        return filterbank.filter_circular(x_target, basis.mp_terms(M, K), coef, dtype)
+    X = basis.mp_basis(x_target, M, K, dtype)
     y = X.dot(coef)
     return y
 
+class MPModel(VolterraModel):
+    """
+    The Memory Polynomial model as a reusable object, see MP_e and MP_v.
+
+    Args:
+        M: memory depth
+        K: non-linearity order
+        coef: the coefficients of an already fitted model
+        dtype: np.complex128, or np.complex64 to run in single precision
+        accumulate: the dtype to form the normal equations in, e.g. np.complex128
+        cache: a pyrfdpd.volterra.cache.BasisCache to reuse the basis of
+               signals seen before in predict
+        cache_fit: also cache the basis of the fitted signals, see VolterraModel
+
+    Example:
+        model = MPModel(3, 7).fit(pa_output, pa_input)
+        pa_input = model.predict(xorg)
+        model.save("mp.npz")
+    """
+
+    def __init__(self, M, K, coef: np.ndarray=None, dtype=np.complex128, accumulate=None, cache=None,
+                 cache_fit=False):
+        assert int(M) == M and M >= 0, "The memory depth should be a non-negative integer."
+        assert int(K) == K and K >= 0, "The non-linearity order should be a non-negative integer."
+        self.M, self.K = int(M), int(K)
+        super().__init__(basis.mp_terms(self.M, self.K), coef, dtype, accumulate, cache, cache_fit)
+
+    def structure(self)->dict:
+        return {"M": self.M, "K": self.K}
+
+    def basis(self, x: np.ndarray)->np.ndarray:
+        return basis.mp_basis(x, self.M, self.K, self.dtype)
+
 if __name__ == "__main__":
     print("This is the MP extraction and evaluation functions.")
     print("To use these function, you need a PA_data.mat file")
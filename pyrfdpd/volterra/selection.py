@@ -0,0 +1,129 @@
+'''
+Copyright 2026 Microwave System Lab or its affiliates. All Rights Reserved.
+File: selection.py
+Authors:
+agent, agent@local
+
+Description:
+Statistics-aware selection of a small training subset for the coefficient
+extraction, in place of keeping the first ratio*N samples.
+
+The amplitude distribution of a modulated signal is concentrated far below
+its peak, while the rare high-amplitude samples define the nonlinearity. A
+truncated capture therefore either loses the peaks or has to stay long.
+The selected indices are passed as `rows` to MP_e/GMP_e or
+VolterraModel.fit, which build only those basis rows, each from its full
+memory context in the whole signal.
+
+    histogram: flattens the amplitude histogram, every amplitude bin gets
+               the same share of samples, the bins holding fewer samples
+               than their share are kept whole
+    leverage:  samples rows with a probability proportional to their
+               statistical leverage in a memoryless polynomial basis of
+               order K, mixed with a uniform share, which favours the peaks
+               without dropping the bulk of the distribution
+
+Example:
+    rows = volterra.selection.select(pa_output, 0.05)
+    coef = volterra.mp.MP_e(pa_output, pa_input, M, K, rows=rows)
+
+Revision history:
+Version   Date        Author      Changes
+1.0    2026-10-17    agent       initial version
+'''
+import numpy as np
+import scipy.linalg
+from . import basis
+from .solver import gram
+
+METHODS = ("histogram", "leverage")
+
+
+def _quota(counts, n):
+    # water filling: bins smaller than the fair share are taken whole and
+    # their unused share is spread over the remaining bins
+    quota = np.zeros_like(counts)
+    left = counts > 0
+    while n > 0 and left.any():
+        share = n // left.sum()
+        small = left & (counts - quota <= share)
+        if not small.any():
+            quota[left] += share
+            extra = n - share*left.sum()
+            # the remainder goes to the bins with the most samples left
+            quota[np.argsort(-(counts - quota) * left)[:extra]] += 1
+            break
+        n -= int(np.sum(counts[small] - quota[small]))
+        quota[small] = counts[small]
+        left &= ~small
+    return quota
+
+def histogram(x: np.ndarray, n, bins=64, rng=None)->np.ndarray:
+    """
+    Select n samples with a flattened amplitude histogram.
+
+    Args:
+        x: the PA input signal
+        n: the number of samples to select
+        bins: the number of uniform amplitude bins over [0, max|x|]
+        rng: a np.random.Generator
+
+    Returns:
+        rows: the sorted indices of the selected samples
+    """
+    rng = np.random.default_rng(rng)
+    a = np.abs(np.ravel(x))
+    index = np.minimum((a * (bins / max(a.max(), np.finfo(float).tiny))).astype(np.intp), bins-1)
+    order = np.argsort(index, kind='stable')
+    counts = np.bincount(index, minlength=bins)
+    quota = _quota(counts, n)
+    starts = np.concatenate([[0], np.cumsum(counts)])
+    rows = [rng.choice(order[starts[b]:starts[b+1]], quota[b], replace=False)
+            for b in np.flatnonzero(quota)]
+    return np.sort(np.concatenate(rows))
+
+def leverage(x: np.ndarray, n, K=7, uniform=0.2, rng=None)->np.ndarray:
+    """
+    Select n samples by leverage-score sampling.
+
+    Args:
+        x: the PA input signal
+        n: the number of samples to select
+        K: the order of the memoryless polynomial basis x*|x|^k, k <= K
+        uniform: the share of the sampling probability spread uniformly
+        rng: a np.random.Generator
+
+    Returns:
+        rows: the sorted indices of the selected samples
+    """
+    rng = np.random.default_rng(rng)
+    X = basis.mp_basis(np.ravel(x), 0, K)
+    G, _ = gram(X, np.zeros(len(X)))
+    # row leverage h = ||R^-H x_n||^2 with G = R^H R, up to the regularization
+    R = scipy.linalg.cholesky(G + 1e-12*np.trace(G).real/len(G)*np.eye(len(G)))
+    h = np.sum(np.abs(scipy.linalg.solve_triangular(R, X.T, trans='C', lower=False))**2, axis=0)
+    prob = (1-uniform) * h / h.sum() + uniform / len(h)
+    return np.sort(rng.choice(len(h), n, replace=False, p=prob))
+
+def select(x: np.ndarray, n, method="histogram", rng=None, **kwargs)->np.ndarray:
+    """
+    Select a training subset of the samples of x.
+
+    Args:
+        x: the PA input signal the basis is built on
+        n: the number of samples to select, an integer, or the fraction of
+           len(x), a float up to 1.0
+        method: "histogram" or "leverage", see the module description
+        rng: a seed or np.random.Generator, for reproducible selections
+        kwargs: the options of the method, bins for "histogram", K and
+                uniform for "leverage"
+
+    Returns:
+        rows: the sorted indices of the selected samples
+    """
+    assert method in METHODS, f"Unknown method {method}, use one of {METHODS}."
+    n = int(n * len(np.ravel(x))) if isinstance(n, (float, np.floating)) and n <= 1 else int(n)
+    assert 0 < n <= len(np.ravel(x)), "The number of selected samples should be in (0, len(x)]."
+    if method == "histogram":
+        return histogram(x, n, rng=rng, **kwargs)
+    return leverage(x, n, rng=rng, **kwargs)
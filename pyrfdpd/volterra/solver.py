@@ -0,0 +1,213 @@
+'''
+Copyright 2026 Microwave System Lab or its affiliates. All Rights Reserved.
+File: solver.py
+Authors:
+agent, agent@local
+
+Description:
+The least-squares solver backends of the Volterra coefficient extraction.
+
+All solvers minimize ||X c - y||^2 + lam*||c||^2 (lstsq drops the penalty):
+    cholesky: Cholesky factorization of the regularized normal equations,
+              followed by two triangular solves, the default
+    lstsq:    QR factorization of X itself, better conditioned but slower
+    ridge:    eigendecomposition of X^H X, lam may be a sequence of values,
+              in which case the whole ridge path is returned
+    pinv:     pseudo-inverse of the regularized normal equations, the
+              historical behaviour of MP_e/GMP_e
+    cg:       Jacobi-preconditioned conjugate gradient on the regularized
+              normal equations, applied as X^H (X v) + lam*v without
+              forming X^H X
+    lsqr:     LSQR on X itself, damped by sqrt(lam), so not on the normal
+              equations alone, see NORMAL
+
+The iterative solvers accept an initial guess x0, e.g. the coefficients of
+the previous DPD iteration, a relative tolerance and an iteration cap, and
+X may be a BasisOperator, which rebuilds the basis chunk by chunk on every
+pass instead of storing it. A warm-started late DPD iteration then costs a
+few passes over the data instead of the O(N*P^2) Gram matrix.
+
+Revision history:
+Version   Date        Author      Changes
+1.0    2026-10-17    agent       initial version
+'''
+import inspect
+import numpy as np
+import scipy.linalg
+import scipy.sparse.linalg
+from scipy.linalg.blas import get_blas_funcs
+from . import basis
+
+SOLVERS = ("cholesky", "lstsq", "ridge", "pinv", "cg", "lsqr")
+ITERATIVE = ("cg", "lsqr")
+# scipy 1.12 renamed the relative tolerance of cg from tol to rtol
+_CG_RTOL = "rtol" if "rtol" in inspect.signature(scipy.sparse.linalg.cg).parameters else "tol"
+NORMAL = ("cholesky", "lstsq", "ridge", "pinv", "cg")  # the solvers of solve_normal
+
+
+class BasisOperator(scipy.sparse.linalg.LinearOperator):
+    """
+    The basis matrix of a periodic signal as a matrix-free linear operator,
+    built `chunk` rows at a time on every product.
+
+    Args:
+        x: the PA input signal
+        terms: the (P, 3) term table, e.g. basis.mp_terms(M, K)
+        dtype: np.complex128, or np.complex64 to build the basis in single precision
+        chunk: the number of rows built at once
+    """
+
+    def __init__(self, x: np.ndarray, terms: np.ndarray, dtype=np.complex128, chunk=65536):
+        x = np.ravel(x)
+        self.terms = np.asarray(terms)
+        self.lag, self.lead = basis.term_depth(self.terms)
+        self.xp = basis.circular_pad(x, self.lag, self.lead)
+        self.chunk = chunk
+        super().__init__(np.dtype(dtype), (len(x), len(self.terms)))
+
+    def blocks(self):
+        """Yield the (start, stop, X[start:stop]) row blocks of the basis."""
+        depth = self.lag + self.lead
+        for start in range(0, self.shape[0], self.chunk):
+            stop = min(start+self.chunk, self.shape[0])
+            yield start, stop, basis.term_basis_padded(self.xp[start:stop+depth], self.terms, self.dtype)
+
+    def _matvec(self, v):
+        y = np.empty(self.shape[0], dtype=np.result_type(self.dtype, v))
+        for start, stop, X in self.blocks():
+            y[start:stop] = X @ np.ravel(v)
+        return y
+
+    def _rmatvec(self, u):
+        r = np.zeros(self.shape[1], dtype=np.result_type(self.dtype, u))
+        for start, stop, X in self.blocks():
+            r += np.conjugate(np.conjugate(np.ravel(u)[start:stop]) @ X)
+        return r
+
+    def normal(self, v: np.ndarray)->np.ndarray:
+        """X^H X v in a single pass over the basis."""
+        r = np.zeros(self.shape[1], dtype=np.result_type(self.dtype, v))
+        for _, _, X in self.blocks():
+            r += np.conjugate(np.conjugate(X @ v) @ X)
+        return r
+
+    def column_norms(self)->np.ndarray:
+        """The squared column norms, the diagonal of X^H X."""
+        d = np.zeros(self.shape[1])
+        for _, _, X in self.blocks():
+            d += np.sum(np.abs(X)**2, axis=0)
+        return d
+
+
+def _normal(X, v):
+    if isinstance(X, BasisOperator):
+        return X.normal(v)
+    return np.conjugate(np.conjugate(X @ v) @ X)
+
+def _cg(A, b, diag, x0, tol, maxiter):
+    # Jacobi preconditioning evens out the column scales |x|^k, which span
+    # many orders of magnitude at high non-linearity orders
+    P = len(b)
+    A = scipy.sparse.linalg.LinearOperator((P, P), matvec=A, dtype=b.dtype)
+    M = scipy.sparse.linalg.LinearOperator((P, P), matvec=lambda v: v / diag, dtype=b.dtype)
+    coef, _ = scipy.sparse.linalg.cg(A, b, x0, maxiter=maxiter, M=M, **{_CG_RTOL: tol})
+    return coef
+
+def gram(X: np.ndarray, y: np.ndarray, accumulate=None, chunk=65536)->tuple:
+    """
+    The normal equations X^H X and X^H y, without copying X.
+
+    Args:
+        X: the (N, P) basis matrix
+        y: the (N,) target signal
+        accumulate: the dtype to accumulate in, e.g. np.complex128 for a
+                    complex64 X, which is then converted chunk by chunk
+        chunk: the number of rows converted at once
+
+    Returns:
+        G: the (P, P) Hermitian Gram matrix
+        b: the (P,) projection of y onto the basis
+    """
+    if accumulate is None or np.dtype(accumulate) == X.dtype:
+        herk = get_blas_funcs('herk', (X,))
+        G = herk(1.0, X, trans=2)  # upper triangle of X^H X
+        b = np.conjugate(np.conjugate(y).dot(X))
+    else:
+        herk = get_blas_funcs('herk', dtype=accumulate)
+        G = np.zeros((X.shape[1], X.shape[1]), dtype=accumulate)
+        b = np.zeros(X.shape[1], dtype=accumulate)
+        for start in range(0, len(X), chunk):
+            Xc = np.asfortranarray(X[start:start+chunk], dtype=accumulate)
+            G = herk(1.0, Xc, beta=1.0, c=G, trans=2, overwrite_c=1)
+            b += np.conjugate(np.conjugate(y[start:start+chunk]).astype(accumulate).dot(Xc))
+    G = np.triu(G) + np.triu(G, 1).conj().T
+    return G, b
+
+def solve_normal(G: np.ndarray, b: np.ndarray, solver="cholesky", lam=1e-6, x0=None, tol=1e-8, maxiter=None)->np.ndarray:
+    """
+    Solve the regularized normal equations (G + lam*I) c = b.
+
+    Args:
+        G: the (P, P) Gram matrix X^H X
+        b: the (P,) vector X^H y
+        solver: one of NORMAL, "lsqr" needs X itself, see solve
+        lam: the Tikhonov regularization, a sequence of values for "ridge"
+        x0: the initial guess of the iterative solvers
+        tol: the relative residual tolerance of the iterative solvers
+        maxiter: the iteration cap of the iterative solvers
+
+    Returns:
+        coef: the (P,) coefficients, or (len(lam), P) for a ridge path
+    """
+    assert solver in NORMAL, f"Solver {solver} does not work on the normal equations, use one of {NORMAL}."
+    if solver == "cg":
+        diag = np.maximum(np.real(np.diag(G)) + lam, np.finfo(float).tiny)
+        return _cg(lambda v: G @ v + lam*v, b, diag, x0, tol, maxiter)
+    if solver == "ridge":
+        s, V = scipy.linalg.eigh(G)
+        Vb = V.conj().T.dot(b)
+        lams = np.atleast_1d(lam)
+        coef = (Vb / (s + lams[:, None])).dot(V.T)
+        return coef if np.ndim(lam) else coef[0]
+    A = G + lam*np.eye(G.shape[0])
+    if solver == "pinv":
+        return np.linalg.pinv(A).dot(b)
+    if solver == "cholesky":
+        try:
+            return scipy.linalg.cho_solve(scipy.linalg.cho_factor(A), b)
+        except np.linalg.LinAlgError:
+            pass  # not numerically positive definite, fall back to lstsq
+    return scipy.linalg.lstsq(A, b, lapack_driver='gelsy')[0]
+
+def solve(X: np.ndarray, y: np.ndarray, solver="cholesky", lam=1e-6, accumulate=None, x0=None, tol=1e-8, maxiter=None)->np.ndarray:
+    """
+    Solve the regularized least-squares problem min ||X c - y||^2 + lam*||c||^2.
+
+    Args:
+        X: the (N, P) basis matrix, or a BasisOperator for "cg" and "lsqr"
+        y: the (N,) target signal
+        solver: one of SOLVERS, see the module description
+        lam: the Tikhonov regularization, ignored by "lstsq"
+        accumulate: the dtype to form the normal equations in, see gram
+        x0: the initial guess of the iterative solvers, e.g. the previous coefficients
+        tol: the relative residual tolerance of the iterative solvers
+        maxiter: the iteration cap of the iterative solvers
+
+    Returns:
+        coef: the (P,) coefficients, or (len(lam), P) for a ridge path
+    """
+    assert solver in ITERATIVE or not isinstance(X, BasisOperator), "A BasisOperator needs an iterative solver."
+    if solver == "cg":
+        if isinstance(X, BasisOperator):
+            diag, b = X.column_norms(), X.rmatvec(y)
+        else:
+            diag, b = np.sum(np.abs(X)**2, axis=0), np.conjugate(np.conjugate(y) @ X)
+        return _cg(lambda v: _normal(X, v) + lam*v, b, np.maximum(diag + lam, np.finfo(float).tiny), x0, tol, maxiter)
+    if solver == "lsqr":
+        # the default cap of 2*P stalls on the spread column scales, use the 10*P of cg
+        maxiter = maxiter or 10*X.shape[1]
+        return scipy.sparse.linalg.lsqr(X, y, damp=np.sqrt(lam), atol=tol, btol=tol, iter_lim=maxiter, x0=x0)[0]
+    if solver == "lstsq":
+        return scipy.linalg.lstsq(X, y, lapack_driver='gelsy', check_finite=False)[0]
+    G, b = gram(X, y, accumulate)
+    return solve_normal(G, b, solver, lam)
@@ -0,0 +1,67 @@
+'''
+Copyright 2026 Microwave System Lab or its affiliates. All Rights Reserved.
+File: sparse.py
+Authors:
+agent, agent@local
+
+Description:
+Sparse term selection by orthogonal matching pursuit (OMP).
+
+The greedy selection runs entirely on the normal equations X^H X and X^H y
+(batch OMP), so after the Gram matrix is formed every step costs O(P*S)
+for the correlation update plus a small S x S solve, S being the number of
+selected terms. The pruned model only evaluates the selected columns, see
+VolterraModel.fit_sparse.
+
+Revision history:
+Version   Date        Author      Changes
+1.0    2026-10-17    agent       initial version
+'''
+import numpy as np
+from .solver import gram, solve_normal
+
+
+def omp_normal(G: np.ndarray, b: np.ndarray, energy: float, n_terms=None, tol_db=None, lam=1e-6)->tuple:
+    """
+    Orthogonal matching pursuit on the normal equations.
+
+    Args:
+        G: the (P, P) Gram matrix X^H X
+        b: the (P,) vector X^H y
+        energy: the target energy y^H y
+        n_terms: stop once this many terms are selected
+        tol_db: stop once the NMSE of the fit, in dB, is below this value
+        lam: regularization of the normal equations
+
+    Returns:
+        support: the indices of the selected terms, in selection order
+        coef: the coefficients of the selected terms
+        nmse: the NMSE in dB after each selection step
+    """
+    assert n_terms is not None or tol_db is not None, "Give a target term count or an NMSE tolerance."
+    P = len(b)
+    n_terms = P if n_terms is None else min(n_terms, P)
+    scale = 1 / np.sqrt(np.maximum(np.real(np.diag(G)), np.finfo(float).tiny))
+    support, nmse = [], []
+    coef = np.zeros(0, dtype=np.complex128)
+    corr = b.copy()
+    while len(support) < n_terms:
+        score = np.abs(corr) * scale
+        score[support] = -1
+        support.append(int(np.argmax(score)))
+        Gs = G[np.ix_(support, support)]
+        coef = solve_normal(Gs, b[support], "cholesky", lam)
+        corr = b - G[:, support].dot(coef)
+        residual = energy - 2*np.real(np.vdot(coef, b[support])) + np.real(np.vdot(coef, Gs.dot(coef)))
+        nmse.append(10*np.log10(max(residual, np.finfo(float).tiny) / energy))
+        if tol_db is not None and nmse[-1] <= tol_db:
+            break
+    return np.array(support), coef, np.array(nmse)
+
+def omp(X: np.ndarray, y: np.ndarray, n_terms=None, tol_db=None, lam=1e-6, accumulate=None)->tuple:
+    """
+    Orthogonal matching pursuit on the basis matrix X and target y, see
+    omp_normal for the arguments and return values, and gram for `accumulate`.
+    """
+    G, b = gram(X, y, accumulate)
+    return omp_normal(G, b, np.real(np.vdot(y, y)), n_terms, tol_db, lam)
@@ -0,0 +1,214 @@
+'''
+Copyright 2026 Microwave System Lab or its affiliates. All Rights Reserved.
+File: streaming.py
+Authors:
+agent, agent@local
+
+Description:
+Block-accumulating coefficient extraction for captures larger than memory,
+and block-by-block evaluation for continuous streams.
+
+Only the normal equations X^H X (P x P) and X^H y (P) are accumulated, the
+basis of a block is dropped as soon as it has been folded in. The last
+lag+lead samples of every block are carried over to the next one, so the
+result equals a batch extraction on the concatenated blocks, except that the
+first `lag` and last `lead` samples of the whole stream only serve as context.
+
+Revision history:
+Version   Date        Author      Changes
+1.0    2026-10-17    agent       initial version
+'''
+import numpy as np
+from . import basis
+from . import filterbank
+from .solver import NORMAL, gram, solve_normal
+
+
+class BlockBasis:
+    """
+    The basis rows and targets of a stream of (x, y) blocks. The last
+    lag+lead samples of every block are carried over to the next one, so the
+    first `lag` samples of the stream only serve as history.
+
+    Args:
+        terms: the (P, 3) term table, e.g. basis.mp_terms(M, K)
+        dtype: np.complex128, or np.complex64 to build the basis in single precision
+    """
+
+    def __init__(self, terms: np.ndarray, dtype=np.complex128):
+        self.terms = np.asarray(terms)
+        self.dtype = dtype
+        self.lag, self.lead = basis.term_depth(self.terms)
+        self.reset()
+
+    def reset(self):
+        """Forget the history."""
+        self._x = np.zeros(0, dtype=np.complex128)
+        self._y = np.zeros(0, dtype=np.complex128)
+
+    def push(self, x: np.ndarray, y: np.ndarray)->tuple:
+        """
+        Append one block of PA input x and PA output y.
+
+        Returns:
+            X: the basis rows that became complete with this block, or None
+            y: the matching targets, or None
+        """
+        assert(len(x) == len(y)), "The length of x and y should be the same."
+        xp = np.concatenate([self._x, np.ravel(x)])
+        yp = np.concatenate([self._y, np.ravel(y)])
+        depth = self.lag + self.lead
+        rows = len(xp) - depth
+        self._x = xp[max(len(xp)-depth, 0):]
+        self._y = yp[max(len(yp)-depth, 0):]
+        if rows <= 0:
+            return None, None
+        return basis.term_basis_padded(xp, self.terms, self.dtype), yp[self.lag:self.lag+rows]
+
+
+class StreamingExtractor:
+    """
+    Streaming coefficient extraction for any model expressed as a term table.
+
+    Args:
+        terms: the (P, 3) term table, e.g. basis.mp_terms(M, K)
+        solver: one of pyrfdpd.volterra.solver.NORMAL
+        lam: regularization of the normal equations
+        dtype: np.complex128, or np.complex64 to build the basis in single precision
+        accumulate: the dtype to form the normal equations in, e.g. np.complex128
+
+    Example:
+        extractor = StreamingExtractor(basis.mp_terms(3, 7))
+        for x, y in blocks(np.load("x.npy", mmap_mode="r"), np.load("y.npy", mmap_mode="r")):
+            extractor.update(x, y)
+        coef = extractor.finalize()
+    """
+
+    def __init__(self, terms: np.ndarray, solver="cholesky", lam=1e-6, dtype=np.complex128, accumulate=None):
+        assert solver in NORMAL, f"The streamed normal equations need one of the solvers {NORMAL}."
+        self.terms = np.asarray(terms)
+        self.solver = solver
+        self.lam = lam
+        self.accumulate = accumulate
+        self.stream = BlockBasis(self.terms, dtype)
+        self.reset()
+
+    def reset(self):
+        """Forget all accumulated data and history."""
+        P = len(self.terms)
+        self.G = np.zeros((P, P), dtype=np.complex128)
+        self.b = np.zeros(P, dtype=np.complex128)
+        self.n_samples = 0
+        self.stream.reset()
+
+    def update(self, x: np.ndarray, y: np.ndarray):
+        """
+        Fold one block of PA input x and PA output y into the normal equations.
+        """
+        X, target = self.stream.push(x, y)
+        if X is not None:
+            G, b = gram(X, target, self.accumulate)
+            self.G += G
+            self.b += b
+            self.n_samples += len(target)
+
+    def finalize(self)->np.ndarray:
+        """
+        Solve the accumulated normal equations.
+
+        Returns:
+            coef: the extracted coefficients, in term table order
+        """
+        assert self.n_samples > 0, "No complete sample has been accumulated yet."
+        return solve_normal(self.G, self.b, self.solver, self.lam)
+
+    def fit(self, blocks)->np.ndarray:
+        """
+        Accumulate an iterator of (x, y) blocks and solve.
+        """
+        for x, y in blocks:
+            self.update(x, y)
+        return self.finalize()
+
+
+def blocks(x: np.ndarray, y: np.ndarray, size=65536):
+    """
+    Iterate over two aligned signals in blocks of `size` samples. Works on
+    memory-mapped arrays, e.g. np.load(file, mmap_mode="r"), so only one
+    block is read from disk at a time.
+    """
+    assert(len(x) == len(y)), "The length of x and y should be the same."
+    for start in range(0, len(x), size):
+        yield np.asarray(x[start:start+size]), np.asarray(y[start:start+size])
+
+
+class Predistorter:
+    """
+    Block-by-block evaluation of a fitted model, e.g. to predistort a
+    continuous stream in fixed-size chunks.
+
+    In streaming mode the last lag+lead input samples are kept as state. A
+    model with leading terms needs `lead` future samples per output, so the
+    output lags the input by `latency` samples, and `flush()` emits the
+    pending ones. Before the first block the input is taken as zero.
+
+    In circular mode every block is treated as one period of a periodic
+    signal, which gives the same result as MP_v/GMP_v on that block.
+
+    Args:
+        terms: the (P, 3) term table, e.g. basis.mp_terms(M, K)
+        coef: the (P,) model coefficients
+        circular: evaluate each block as a periodic signal
+        dtype: np.complex128, or np.complex64 to evaluate in single precision
+
+    Example:
+        dpd = Predistorter(basis.mp_terms(3, 7), coef)
+        for block in stream:
+            send(dpd.process(block))
+        send(dpd.flush())
+    """
+
+    def __init__(self, terms: np.ndarray, coef: np.ndarray, circular=False, dtype=np.complex128):
+        self.terms = np.asarray(terms)
+        self.coef = np.asarray(coef)
+        assert len(self.coef) == len(self.terms), "The number of coefficients and terms should be the same."
+        self.circular = circular
+        self.dtype = dtype
+        self.lag, self.lead = basis.term_depth(self.terms)
+        self.latency = 0 if circular else self.lead
+        self.reset()
+
+    def reset(self, history: np.ndarray=None):
+        """
+        Restart the stream, optionally from the last `lag` samples before it.
+        """
+        self._x = np.zeros(self.lag, dtype=self.dtype)
+        if history is not None and self.lag:
+            history = np.ravel(history)[-self.lag:]
+            self._x[self.lag-len(history):] = history
+
+    def process(self, block: np.ndarray)->np.ndarray:
+        """
+        Predistort one block of samples.
+
+        Returns:
+            y: the model output, as many samples as the block in circular
+               mode, otherwise the outputs that became complete with this block
+        """
+        if self.circular:
+            xp = basis.circular_pad(block, self.lag, self.lead)
+        else:
+            xp = np.concatenate([self._x, np.ravel(block)])
+            depth = self.lag + self.lead
+            self._x = xp[max(len(xp)-depth, 0):]
+            if len(xp) <= depth:
+                return np.zeros(0, dtype=self.dtype)
+        return filterbank.filter_padded(xp, self.terms, self.coef, self.dtype)
+
+    def flush(self)->np.ndarray:
+        """
+        Emit the last `latency` outputs, taking the future input as zero.
+        """
+        if self.circular or self.lead == 0:
+            return np.zeros(0, dtype=self.dtype)
+        return self.process(np.zeros(self.lead, dtype=self.dtype))
@@ -0,0 +1,104 @@
+'''
+Copyright 2026 Microwave System Lab or its affiliates. All Rights Reserved.
+File: sweep.py
+Authors:
+agent, agent@local
+
+Description:
+Model-structure sweep with nested Gram-matrix reuse.
+
+The basis of the union of all candidate term tables, i.e. of the largest
+configuration when the candidates are nested, is built once on the training
+and once on the validation signal, and reduced to its normal equations.
+Every candidate is then fitted on a sub-block of X^H X and X^H y and scored
+from the validation normal equations, using
+
+    ||y - X c||^2 = y^H y - 2 Re(c^H X^H y) + c^H X^H X c
+
+so the solves only need P x P matrices and can be spread over a process pool.
+
+Revision history:
+Version   Date        Author      Changes
+1.0    2026-10-17    agent       initial version
+'''
+import itertools
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor
+from . import basis
+from .solver import NORMAL, gram, solve_normal
+from .mp import MPModel
+from .gmp import GMPModel
+
+_normal = {}
+
+
+def mp_grid(M: list, K: list)->list:
+    """All MPModel candidates of the given memory depths and orders."""
+    return [MPModel(m, k) for m, k in itertools.product(M, K)]
+
+def gmp_grid(K: list, L: list, M: list)->list:
+    """All GMPModel candidates of the given lists of K, L and M triples/pairs."""
+    return [GMPModel(k, l, m) for k, l, m in itertools.product(K, L, M)]
+
+def _init(normal):
+    _normal.update(normal)
+
+def _score(index, solver, lam):
+    G, b, Gv, bv = _normal["G"], _normal["b"], _normal["Gv"], _normal["bv"]
+    ix = np.ix_(index, index)
+    coef = solve_normal(G[ix], b[index], solver, lam)
+    nmse = []
+    for G_, b_, energy in ((G, b, _normal["energy"]), (Gv, bv, _normal["energy_v"])):
+        residual = energy - 2*np.real(np.vdot(coef, b_[index])) + np.real(np.vdot(coef, G_[ix].dot(coef)))
+        nmse.append(10*np.log10(max(residual, np.finfo(float).tiny) / energy))
+    return coef, nmse
+
+def sweep(models: list, x: np.ndarray, y: np.ndarray, x_val: np.ndarray=None, y_val: np.ndarray=None,
+          solver="cholesky", lam=1e-6, n_jobs=1)->list:
+    """
+    Fit and score a list of candidate models sharing one basis build.
+
+    Args:
+        models: the candidate VolterraModel objects, e.g. from mp_grid, they
+                are fitted in place
+        x: the PA input signal for training
+        y: the measured PA output signal for training
+        x_val: the PA input signal for validation, the training one if None
+        y_val: the measured PA output signal for validation
+        solver: least-squares backend, see pyrfdpd.volterra.solver
+        lam: regularization of the normal equations
+        n_jobs: number of worker processes, 1 solves in this process
+
+    Returns:
+        table: one dict per model with the keys "model", "n_coef",
+               "nmse_train" and "nmse_val" (in dB), sorted by "n_coef"
+    """
+    assert(len(x) == len(y)), "The length of x and y should be the same."
+    assert solver in NORMAL, f"The shared normal equations need one of the solvers {NORMAL}."
+    if x_val is None:
+        x_val, y_val = x, y
+    terms, inverse = np.unique(np.concatenate([m.terms for m in models]), axis=0, return_inverse=True)
+    inverse = np.ravel(inverse)
+    bounds = np.cumsum([0] + [len(m.terms) for m in models])
+    indices = [inverse[bounds[i]:bounds[i+1]] for i in range(len(models))]
+
+    normal = {}
+    for key, x_, y_ in (("", x, y), ("v", x_val, y_val)):
+        G, b = gram(basis.term_basis(x_, terms), np.ravel(y_))
+        normal["G"+key], normal["b"+key] = G, b
+        normal["energy_v" if key else "energy"] = np.real(np.vdot(y_, y_))
+
+    if n_jobs == 1:
+        _init(normal)
+        results = [_score(index, solver, lam) for index in indices]
+        _normal.clear()
+    else:
+        with ProcessPoolExecutor(n_jobs, initializer=_init, initargs=(normal,)) as pool:
+            futures = [pool.submit(_score, index, solver, lam) for index in indices]
+            results = [future.result() for future in futures]
+
+    table = []
+    for model, (coef, (nmse_train, nmse_val)) in zip(models, results):
+        model.coef = coef
+        table.append({"model": model, "n_coef": len(coef), "nmse_train": nmse_train, "nmse_val": nmse_val})
+    return sorted(table, key=lambda row: row["n_coef"])
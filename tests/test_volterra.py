@@ -1,6 +1,5 @@
 import tomli
 import logging
-from functools import partial
 from scipy.io import loadmat, savemat
 import pyrfdpd.volterra as volterra
 import pyrfdpd.visa as visa
@@ -50,19 +49,18 @@ att = common_dict["instrument"]["configuration"]["attenuation"]
 # Model configuration
 model = config_dict["model"]["model_name"]
 iteration = config_dict["model"]["hyperparameters"]["iteration"]
+basis_cache = volterra.cache.BasisCache() # the basis of xorg is reused across iterations
 if model == "MP":
     M = config_dict["model"]["memory_depth"]
     K = config_dict["model"]["nonlinear_order"]
     ratio = config_dict['model']['hyperparameters']['ratio']
-    model_e = partial(volterra.mp.MP_e, M = M, K = K, ratio=ratio)
-    model_v = partial(volterra.mp.MP_v, M = M, K = K)
+    dpd = volterra.MPModel(M, K, cache=basis_cache)
 elif model == "GMP":
     M = config_dict["model"]["memory_depth"]
     K = config_dict["model"]["nonlinear_order"]
     L = config_dict["model"]["lagging_depth"]
     ratio = config_dict['model']['hyperparameters']['ratio']
-    model_e = partial(volterra.gmp.GMP_e, M = M, K = K, L = L, ratio=ratio)
-    model_v = partial(volterra.gmp.GMP_v, M = M, K = K, L = L)
+    dpd = volterra.GMPModel(K, L, M, cache=basis_cache)
 else:
     pass
 
@@ -79,12 +77,12 @@ pa_input, pa_output = xorg.copy(), yorg.copy()
 # DPD iteration
 for idx in range(iteration):
     logger.debug(f"Start the {idx+1}th iteration")
-    cc = model_e(pa_output, pa_input)
-    pa_input = model_v(xorg, cc) # Generate new input based on new coefficients
+    dpd.fit(pa_output, pa_input, ratio=ratio)
+    pa_input = dpd.predict(xorg) # Generate new input based on new coefficients
     visa.down_signal(sg_brand, pa_input, fc, fs, pow, sg_ip, logger=logger)
     pa_output = visa.collect_signal(sa_brand, fc, fs, att, sa_ip, logger=logger)
     pa_output = align.align(xorg, pa_output)
-logger.debug("DPD done!")
+logger.debug(f"DPD done! Basis cache: {basis_cache.stats()}")
 
 # Save results and plots
 mdict = {"xorg": xorg, "yorg": yorg, "wDPD": pa_output}